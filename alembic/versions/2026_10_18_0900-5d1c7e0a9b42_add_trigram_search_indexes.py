@@ -0,0 +1,58 @@
+"""add trigram search indexes
+
+Revision ID: 5d1c7e0a9b42
+Revises: eb4e6a8b364c
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel             # NEW
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c7e0a9b42'
+down_revision: Union[str, None] = 'eb4e6a8b364c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# columns searched by the repositories' `search` parameter
+SEARCH_COLUMNS = {
+    'users': ['first_name', 'last_name', 'email', 'username'],
+    'hero': ['name', 'secret_name'],
+    'hero_publisher': ['name'],
+}
+
+
+def upgrade() -> None:
+    # pg_trgm only exists on Postgres, other databases keep the LIKE fallback
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CONCURRENTLY keeps the tables writable while the indexes build, and
+    # can't run inside the migration's transaction
+    with op.get_context().autocommit_block():
+        for table, columns in SEARCH_COLUMNS.items():
+            for column in columns:
+                op.create_index(
+                    f'ix_{table}_{column}_trgm', table, [column], unique=False,
+                    postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for table, columns in SEARCH_COLUMNS.items():
+            for column in columns:
+                op.drop_index(
+                    f'ix_{table}_{column}_trgm', table_name=table,
+                    postgresql_concurrently=True,
+                )
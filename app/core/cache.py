@@ -0,0 +1,167 @@
+# Defines caches shared across requests: authenticated users and list counts.
+
+import functools
+import json
+from typing import Any, Dict, Hashable, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import make_transient_to_detached
+
+from ..logger import logging
+from ..models import Status, User, UserProfile
+from ..utils.cache import TTLCache
+
+from .config import settings
+from .redis import redismanager
+
+
+@functools.lru_cache(maxsize=None)
+def _field_adapter(model: type, name: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[name].annotation)
+
+
+def _restore(model: type, data: Dict[str, Any]) -> Any:
+    # JSON has no dates: validate each column back into its declared type
+    return model(**{key: _field_adapter(model, key).validate_python(value) for key, value in data.items()})
+
+
+def dump_user(user: User) -> str:
+    """Columns needed to authorize a request: no password hash, no mapper state."""
+    data = user.model_dump(mode="json", exclude={"password"})
+    profile = user.profile
+    if profile is not None:
+        data["profile"] = profile.model_dump(mode="json")
+        data["profile"]["status"] = profile.status.model_dump(mode="json") if profile.status is not None else None
+    return json.dumps(data)
+
+
+def load_user(blob: Any) -> User:
+    """Detached `User` (+ profile and status) that `session.merge(load=False)` accepts.
+
+    Columns missing from the cached dict, like `password`, stay unloaded and
+    are fetched if something reads them.
+    """
+    data = json.loads(blob)
+    profile_data = data.pop("profile", None)
+
+    user = _restore(User, data)
+    instances = [user]
+    if profile_data is not None:
+        status_data = profile_data.pop("status", None)
+        profile = _restore(UserProfile, profile_data)
+        if status_data is not None:
+            profile.status = _restore(Status, status_data)
+            instances.append(profile.status)
+        user.profile = profile
+        instances.append(profile)
+
+    for instance in instances:
+        make_transient_to_detached(instance)
+    return user
+
+
+class UserCache:
+    """Two tier cache of loaded `User` rows keyed by email.
+
+    Entries are JSON dicts of the user, profile and status columns (see
+    `dump_user`), so nothing from the shared tier is ever unpickled and every
+    hit yields a fresh detached copy that can be merged into the caller's
+    session without a SELECT. The in-process tier is always used; the Redis
+    tier is optional and shared by all workers.
+    """
+
+    def __init__(self, maxsize: int, ttl: int, use_redis: bool = False):
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return f"user_cache:{email}"
+
+    async def get(self, email: str) -> Optional[User]:
+        blob = self._local.get(email)
+
+        if blob is None and self.use_redis:
+            try:
+                blob = await redismanager.client.get(self._key(email))
+            except Exception as e:
+                logging.error("user cache get failed: %s", e)
+                blob = None
+
+            if blob is not None:
+                self._local.set(email, blob)
+
+        if blob is None:
+            return None
+
+        try:
+            return load_user(blob)
+        except ValueError as e:
+            # written by an older release, or not by us: a miss, not an error
+            logging.error("user cache entry unreadable: %s", e)
+            self._local.pop(email)
+            return None
+
+    async def set(self, user: User) -> None:
+        blob = dump_user(user)
+        self._local.set(user.email, blob)
+
+        if self.use_redis:
+            try:
+                await redismanager.client.set(self._key(user.email), blob, ex=self.ttl)
+            except Exception as e:
+                logging.error("user cache set failed: %s", e)
+
+    async def invalidate(self, email: str) -> None:
+        self._local.pop(email)
+
+        if self.use_redis:
+            try:
+                await redismanager.client.delete(self._key(email))
+            except Exception as e:
+                logging.error("user cache invalidate failed: %s", e)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL,
+    use_redis=settings.USER_CACHE_REDIS,
+)
+
+
+class CountCache:
+    """Total counts of list queries, keyed by table and query signature.
+
+    Writes bump the table's generation instead of scanning for matching
+    keys, which orphans every cached count of that table at once.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: Dict[str, int] = {}
+
+    def _key(self, table: str, signature: Hashable) -> tuple:
+        return (table, self._generations.get(table, 0), signature)
+
+    def get(self, table: str, signature: Hashable) -> Optional[int]:
+        return self._local.get(self._key(table, signature))
+
+    def set(self, table: str, signature: Hashable, total: int) -> None:
+        self._local.set(self._key(table, signature), total)
+
+    def invalidate(self, table: str) -> None:
+        self._generations[table] = self._generations.get(table, 0) + 1
+
+    def clear(self) -> None:
+        self._local.clear()
+        self._generations.clear()
+
+
+count_cache = CountCache(
+    maxsize=settings.PAGINATION_COUNT_CACHE_MAXSIZE,
+    ttl=settings.PAGINATION_COUNT_CACHE_TTL,
+)
@@ -1,6 +1,7 @@
 # global configs
 
 from pathlib import Path
+from typing import Dict, List, Optional
 
 from fastapi_mail import ConnectionConfig, FastMail, MessageSchema
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,6 +22,71 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int
     TOKEN_TYPE: str = "Bearer"
 
+    # bcrypt runs in a bounded pool: "thread" or "process"
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # image decode/resize/encode runs in a bounded pool: "process" or "thread"
+    IMAGE_EXECUTOR: str = "process"
+    IMAGE_WORKERS: int = 2
+    IMAGE_MAX_QUEUE: int = 32
+    # uploaded images are stored as these variants, longest side in pixels
+    IMAGE_VARIANT_SIZES: Dict[str, int] = {"thumbnail": 160, "medium": 640, "large": 1280}
+    # profile photos are square crops
+    PHOTO_VARIANT_SIZES: Dict[str, int] = {"thumbnail": 64, "medium": 256, "large": 512}
+    # encoded when Pillow supports them, jpeg is always added as a fallback
+    IMAGE_VARIANT_FORMATS: List[str] = ["jpeg", "webp", "avif"]
+
+    # where uploads are stored: "local" (served from /static) or "s3"
+    STORAGE_BACKEND: str = "local"
+    # local keys (static/media/...) resolve against this directory
+    STORAGE_LOCAL_ROOT: str = "."
+    S3_BUCKET: str = ""
+    # set for S3 compatible services (MinIO, R2, ...), empty for AWS
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_REGION: Optional[str] = None
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    # base url of public objects, defaults to the endpoint / bucket url
+    S3_PUBLIC_URL: Optional[str] = None
+    # files above the threshold are uploaded in parts, several at once
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    S3_MULTIPART_CHUNK_SIZE: int = 8 * 1024 * 1024
+    S3_MAX_CONCURRENCY: int = 4
+
+    # Cache-Control max-age of /static files, content-addressed ones are immutable
+    STATIC_MAX_AGE: int = 3600
+    STATIC_IMMUTABLE_MAX_AGE: int = 31536000
+
+    # process wide cache of verified jwt claims
+    TOKEN_CACHE_MAXSIZE: int = 10_000
+    TOKEN_CACHE_TTL: int = 60
+
+    # records are queued by the caller and written by a background thread
+    LOG_LEVEL: str = "WARNING"
+    # "json" or "text"
+    LOG_FORMAT: str = "json"
+    # empty to log to stdout only
+    LOG_FILE: str = "logfile.log"
+    # "watch" reopens the file once an external logrotate moved it, safe with
+    # several processes (workers, email worker) appending to the same file;
+    # "size" / "time" rotate in-process, only for a file one process writes;
+    # "" never rotates
+    LOG_ROTATION: str = "watch"
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_ROTATE_WHEN: str = "midnight"
+    LOG_BACKUP_COUNT: int = 5
+    # records logged while the queue is full are dropped, never waited on
+    LOG_QUEUE_SIZE: int = 10_000
+    # access log level, "WARNING" turns it off; only this share of 2xx lines is kept
+    LOG_ACCESS_LEVEL: str = "INFO"
+    LOG_ACCESS_SAMPLE_RATE: float = 0.1
+
+    # request, database pool, Redis and executor metrics served at /metrics;
+    # unauthenticated, so only enable it where the port isn't public
+    METRICS_ENABLED: bool = False
+
     #############################################
     # PostgreSQL database environment variables
     #############################################
@@ -32,7 +98,61 @@ class Settings(BaseSettings):
     DATABASE_PORT: int
     DATABASE_URL: str
 
+    # connection pool, ignored for SQLite
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_PRE_PING: bool = True
+    # connections opened at startup
+    DATABASE_POOL_WARMUP: int = 2
+    # asyncpg prepared statement cache per connection, 0 behind pgbouncer transaction pooling
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    # server-side statement_timeout in milliseconds, 0 disables it
+    DATABASE_STATEMENT_TIMEOUT: int = 30_000
+
+    # read replicas for list/detail endpoints, e.g. '["postgresql+asyncpg://...", ...]'
+    DATABASE_REPLICA_URLS: List[str] = []
+    # round_robin or least_connections
+    DATABASE_REPLICA_STRATEGY: str = "round_robin"
+    # seconds of replication lag before a replica is skipped in favour of the primary
+    DATABASE_REPLICA_MAX_LAG: float = 5.0
+    DATABASE_REPLICA_CHECK_INTERVAL: float = 10.0
+
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+
+    # local bloom filter in front of the jwt blocklist
+    BLOCKLIST_BLOOM_ENABLED: bool = True
+    BLOCKLIST_BLOOM_CAPACITY: int = 100_000
+    BLOCKLIST_BLOOM_ERROR_RATE: float = 0.001
+    BLOCKLIST_SYNC_INTERVAL: float = 2.0
+
+    # cache of the authenticated user used by GetCurrentUser
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL: int = 30
+    USER_CACHE_MAXSIZE: int = 10_000
+    USER_CACHE_REDIS: bool = False
+
+    # default total count strategy for list endpoints: exact, cached or estimate
+    PAGINATION_COUNT_STRATEGY: str = "exact"
+    PAGINATION_COUNT_CACHE_TTL: int = 30
+    PAGINATION_COUNT_CACHE_MAXSIZE: int = 1024
+
+    # max items accepted by a bulk create/update/delete request
+    BULK_MAX_ITEMS: int = 1000
+    # rows fetched per round trip by streaming exports
+    EXPORT_BATCH_SIZE: int = 1000
+    # rows validated and written per transaction by imports
+    IMPORT_BATCH_SIZE: int = 5000
+    # rejected rows listed in an import report, the rest are only counted
+    IMPORT_MAX_ERRORS: int = 100
+
+    # search backend: auto (pg_trgm on Postgres, LIKE elsewhere), trigram or like
+    SEARCH_BACKEND: str = "auto"
 
     #############################################
     # Mail variables
@@ -48,6 +168,25 @@ class Settings(BaseSettings):
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
 
+    # "background" sends from the web worker after the response, "outbox"
+    # stores emails with the request's transaction for the email worker
+    EMAIL_BACKEND: str = "background"
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_INTERVAL: float = 2.0
+    # seconds a claimed email stays hidden from other workers
+    EMAIL_OUTBOX_LEASE: int = 300
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    # retry delay doubles per attempt from the base, capped at the max
+    EMAIL_OUTBOX_BACKOFF_BASE: float = 30.0
+    EMAIL_OUTBOX_BACKOFF_MAX: float = 3600.0
+    # SMTP sessions kept open and reused by the email worker
+    EMAIL_SMTP_POOL_SIZE: int = 4
+    EMAIL_SMTP_TIMEOUT: float = 30.0
+    # compiled email templates are cached here across restarts, empty to disable
+    EMAIL_TEMPLATE_CACHE_DIR: str = ".cache/jinja"
+    # re-check template files for changes on every render (development)
+    EMAIL_TEMPLATE_AUTO_RELOAD: bool = False
+
     #############################################
     # OpenAPI variables
     #############################################
@@ -1,30 +1,187 @@
 # db connection related stuff
+import asyncio
 import contextlib
-from typing import Any, AsyncIterator
+import itertools
+from typing import Any, AsyncIterator, Optional, Sequence
 
+from fastapi import Depends
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (AsyncConnection, AsyncEngine, AsyncSession,
                                     async_sessionmaker, create_async_engine)
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import text
 from sqlmodel import SQLModel, create_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ..logger import logging
+
 from .config import settings
 
 
+def engine_options(url: str, echo: bool = False) -> dict[str, Any]:
+    """Build `create_async_engine` kwargs for `url` from settings.
+
+    Pool options only apply to server databases; SQLite keeps SQLAlchemy's
+    defaults since its connections are files, not sockets.
+    """
+    options: dict[str, Any] = {"echo": echo}
+
+    db_url = make_url(url)
+    if db_url.get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    )
+
+    if db_url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            # milliseconds, enforced by the server for every statement of the connection
+            "server_settings": {"statement_timeout": str(settings.DATABASE_STATEMENT_TIMEOUT)},
+        }
+
+    return options
+
+
+# seconds a Postgres standby is behind; 0 when it has replayed everything it received
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    """Read-only engine plus the health seen by the last lag check."""
+
+    def __init__(self, host: str, engine_kwargs: dict[str, Any]):
+        self.engine = create_async_engine(host, **engine_kwargs)
+        self.sessionmaker = async_sessionmaker(
+            bind=self.engine, class_=AsyncSession, autocommit=False, expire_on_commit=False
+        )
+        self.healthy = True
+        self.lag = 0.0
+
+    @property
+    def in_use(self) -> int:
+        checkedout = getattr(self.engine.pool, "checkedout", None)
+        return checkedout() if callable(checkedout) else 0
+
+
 class DatabaseSessionManager:
-    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] = {},
+        replica_hosts: Sequence[str] = (),
+        replica_strategy: str = "round_robin",
+        replica_max_lag: float = 5.0,
+    ):
         self._engine = create_async_engine(host, **engine_kwargs)
         self._sessionmaker = async_sessionmaker(
             bind=self._engine, class_=AsyncSession, autocommit=False, expire_on_commit=False
         )
 
+        self._replicas = [Replica(replica_host, engine_kwargs) for replica_host in replica_hosts]
+        self._replica_strategy = replica_strategy
+        self._replica_max_lag = replica_max_lag
+        self._round_robin = itertools.count()
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
     async def close(self):
         if self._engine is None:  # pragma: no cover
             raise Exception("DatabaseSessionManager is not initialized")
         await self._engine.dispose()
+        for replica in self._replicas:
+            await replica.engine.dispose()
 
         self._engine = None
         self._sessionmaker = None
+        self._replicas = []
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """Connection counts of each engine's pool, keyed "primary", "replica0", ..."""
+        engines = [("primary", self._engine)] if self._engine is not None else []
+        engines += [(f"replica{i}", replica.engine) for i, replica in enumerate(self._replicas)]
+
+        stats = {}
+        for name, engine in engines:
+            pool = engine.pool
+            # only queue pools keep counts; SQLite may use a pool without them
+            if not callable(getattr(pool, "checkedout", None)):
+                continue
+            stats[name] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                # negative while fewer than `size` connections were ever opened
+                "overflow": max(0, pool.overflow()),
+            }
+        return stats
+
+    def pick_replica(self) -> Optional[Replica]:
+        """Choose a healthy replica, None when reads must go to the primary."""
+        healthy = [replica for replica in self._replicas if replica.healthy]
+        if not healthy:
+            return None
+
+        if self._replica_strategy == "least_connections":
+            return min(healthy, key=lambda replica: replica.in_use)
+
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    async def check_replicas(self) -> None:
+        """Mark replicas lagging more than `replica_max_lag` seconds (or unreachable) unhealthy."""
+        for replica in self._replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    if conn.dialect.name == "postgresql":
+                        replica.lag = float(await conn.scalar(REPLICA_LAG_QUERY))
+                    else:
+                        await conn.execute(text("SELECT 1"))
+                        replica.lag = 0.0
+
+                replica.healthy = replica.lag <= self._replica_max_lag
+            except Exception as e:
+                replica.healthy = False
+                logging.error("replica check failed: %s", e)
+
+    async def monitor_replicas(self, interval: float) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(interval)
+
+    async def warmup(self, connections: int) -> int:
+        """Open up to `connections` pooled connections so first requests skip the handshake."""
+        if self._engine is None:  # pragma: no cover
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        pool_size = getattr(self._engine.pool, "size", None)
+        if callable(pool_size):
+            connections = min(connections, pool_size())
+
+        engines = [self._engine] + [replica.engine for replica in self._replicas]
+
+        # hold them all at once, otherwise the pool would hand back the same one
+        async with contextlib.AsyncExitStack() as stack:
+            opened = await asyncio.gather(
+                *(stack.enter_async_context(engine.connect()) for engine in engines for _ in range(connections)),
+                return_exceptions=True,
+            )
+
+        failed = [e for e in opened if isinstance(e, BaseException)]
+        for e in failed:
+            logging.error("database warm-up failed: %s", e)
+
+        return len(opened) - len(failed)
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -52,8 +209,40 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    def new_session(self, readonly: bool = False) -> AsyncSession:
+        """Bare session the caller must close, on a replica when `readonly` and one is healthy."""
+        if self._sessionmaker is None:  # pragma: no cover
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        replica = self.pick_replica() if readonly else None
+        return replica.sessionmaker() if replica is not None else self._sessionmaker()
+
+    @contextlib.asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        """Session on a healthy replica, or on the primary when there is none."""
+        replica = self.pick_replica()
+        if replica is None:
+            async with self.session() as session:
+                yield session
+            return
+
+        session = replica.sessionmaker()
+        try:
+            yield session
+        except Exception:  # pragma: no cover
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
 
-sessionmanager = DatabaseSessionManager(settings.DATABASE_URL, {"echo": settings.DEBUG})
+sessionmanager = DatabaseSessionManager(
+    settings.DATABASE_URL,
+    engine_options(settings.DATABASE_URL, settings.DEBUG),
+    replica_hosts=settings.DATABASE_REPLICA_URLS,
+    replica_strategy=settings.DATABASE_REPLICA_STRATEGY,
+    replica_max_lag=settings.DATABASE_REPLICA_MAX_LAG,
+)
 
 
 async def get_session():  # pragma: no cover
@@ -61,6 +250,29 @@ async def get_session():  # pragma: no cover
         yield session
 
 
+async def get_read_session(session: AsyncSession = Depends(get_session)):
+    """Session for read-only endpoints, on a replica when any is configured and healthy.
+
+    Without replicas it is the request's primary session, so reads and
+    writes of one request share a transaction.
+    """
+    if not sessionmanager.has_replicas:
+        yield session
+        return
+
+    async with sessionmanager.read_session() as read_session:
+        yield read_session
+
+
+def get_stream_session() -> AsyncSession:
+    """Read session owned by a streaming response rather than the request.
+
+    Dependencies with `yield` are torn down before a `StreamingResponse` body
+    runs, so the body closes this session itself once it is exhausted.
+    """
+    return sessionmanager.new_session(readonly=True)
+
+
 async def init_db() -> None:  # pragma: no cover
     async with sessionmanager.connect() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
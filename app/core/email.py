@@ -1,11 +1,19 @@
 # Defines functions for sending emails.
 
+import asyncio
+import contextlib
+from email.message import EmailMessage
+from email.utils import formataddr, formatdate, make_msgid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+import aiosmtplib
 from fastapi import BackgroundTasks
 from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
 
 from ..schemas.email_schema import EmailSchema
 
 from .config import settings
+from .templating import EmailTemplates
 
 email_conf = ConnectionConfig(
     MAIL_USERNAME=settings.MAIL_USERNAME,
@@ -24,23 +32,132 @@ email_conf = ConnectionConfig(
 
 fm = FastMail(email_conf)
 
+# compiled once per process; fastapi-mail would build a new environment and
+# re-parse the template for every message
+email_templates = EmailTemplates(
+    email_conf.TEMPLATE_FOLDER,
+    cache_dir=settings.EMAIL_TEMPLATE_CACHE_DIR,
+    auto_reload=settings.EMAIL_TEMPLATE_AUTO_RELOAD,
+)
+
 
 def send_email_background(
     background_tasks: BackgroundTasks,
     email: EmailSchema,
     template_name: str,
 ):
+    # fm = FastMail(email_conf)
+
+    background_tasks.add_task(
+        send_template_email, email, template_name)
+
+
+async def send_template_email(email: EmailSchema, template_name: str) -> None:
+    # rendered with the shared environment, fastapi-mail only sends the html
     message = MessageSchema(
-        subject=email.model_dump().get("subject"),
-        recipients=email.model_dump().get("emails"),
-        template_body=email.model_dump().get("body"),
+        subject=email.subject,
+        recipients=email.emails,
+        body=email_templates.render(template_name, email.body),
         subtype=MessageType.html,
     )
 
-    # fm = FastMail(email_conf)
+    await fm.send_message(message)
 
-    background_tasks.add_task(
-        fm.send_message, message, template_name=template_name)
+
+def build_message(
+    subject: str,
+    recipients: Sequence[str],
+    body: Dict[str, Any],
+    template_name: str,
+) -> EmailMessage:
+    """Render an html template into a ready to send message."""
+    html = email_templates.render(template_name, body)
+
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM))
+    message["To"] = ", ".join(recipients)
+    message["Date"] = formatdate(localtime=True)
+    message["Message-ID"] = make_msgid()
+    message.set_content(html, subtype="html")
+
+    return message
+
+
+def smtp_client() -> aiosmtplib.SMTP:
+    credentials = settings.USE_CREDENTIALS
+    return aiosmtplib.SMTP(
+        hostname=settings.MAIL_SERVER,
+        port=settings.MAIL_PORT,
+        # connect() logs in when credentials are given
+        username=settings.MAIL_USERNAME if credentials else None,
+        password=settings.MAIL_PASSWORD if credentials else None,
+        use_tls=settings.MAIL_SSL_TLS,
+        start_tls=settings.MAIL_STARTTLS,
+        validate_certs=settings.VALIDATE_CERTS,
+        timeout=settings.EMAIL_SMTP_TIMEOUT,
+    )
+
+
+class SMTPPool:
+    """Keeps up to `size` SMTP sessions open and reuses them across messages.
+
+    Connecting, TLS and login are paid once per session instead of once per
+    email. A session that fails is dropped, the next use opens a new one.
+    """
+
+    def __init__(self, size: int, factory: Callable[[], aiosmtplib.SMTP] = smtp_client):
+        self.size = size
+        self._factory = factory
+        self._idle: List[aiosmtplib.SMTP] = []
+        self._slots = asyncio.Semaphore(size)
+        self.connects = 0
+
+    async def _open(self) -> aiosmtplib.SMTP:
+        smtp = self._factory()
+        await smtp.connect()
+        self.connects += 1
+        return smtp
+
+    @contextlib.asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        async with self._slots:
+            smtp = self._idle.pop() if self._idle else await self._open()
+            try:
+                yield smtp
+            except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused):
+                # the server refused this message, the session itself is fine
+                self._idle.append(smtp)
+                raise
+            except Exception:
+                smtp.close()
+                raise
+
+            self._idle.append(smtp)
+
+    async def send(self, message: EmailMessage) -> None:
+        async with self.connection() as smtp:
+            try:
+                await smtp.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # the server closed an idle session, retry once on a fresh one
+                smtp.close()
+                await smtp.connect()
+                self.connects += 1
+                await smtp.send_message(message)
+
+    async def send_batch(self, messages: Sequence[EmailMessage]) -> List[Optional[Exception]]:
+        """Send concurrently over the pool; the error of each message, None when sent."""
+        results = await asyncio.gather(*(self.send(message) for message in messages), return_exceptions=True)
+        return [result if isinstance(result, Exception) else None for result in results]
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for smtp in idle:
+            try:
+                await smtp.quit()
+            except Exception:
+                smtp.close()
 
 
 # async def send_email_async(
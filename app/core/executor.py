@@ -0,0 +1,97 @@
+# Defines bounded worker pools used to keep CPU-bound work off the event loop.
+
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from ..utils.exceptions import ExecutorBusy
+
+
+def process_context() -> multiprocessing.context.BaseContext:
+    # by the time a pool starts the process runs other threads (thread pools,
+    # the log listener); forking it could leave a worker holding a copy of a
+    # lock no thread will ever release, so workers start from a clean process
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class BoundedExecutor:
+    """Runs blocking functions in a thread or process pool with a queue cap.
+
+    At most `max_workers` jobs run at once; up to `max_queue` more may wait
+    for a free worker, anything beyond that is rejected with `ExecutorBusy`
+    so a burst degrades into fast failures instead of an ever-growing backlog.
+    """
+
+    def __init__(self, name: str, kind: str = "thread", max_workers: int = 4, max_queue: int = 64):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self._executor: Optional[Executor] = None
+
+        # counters are only touched from the event loop thread
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=process_context())
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs accepted but still waiting for a free worker."""
+        return max(0, self._in_flight - self.max_workers)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self.queue_depth >= self.max_queue:
+            self._rejected += 1
+            raise ExecutorBusy(f"{self.name} executor queue is full")
+
+        loop = asyncio.get_running_loop()
+
+        self._in_flight += 1
+        self._submitted += 1
+        try:
+            result = await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+        self._completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
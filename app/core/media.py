@@ -0,0 +1,15 @@
+# Defines helpers for image variant manifests that need no image library.
+
+from .storage import storage
+
+
+def largest_variant(variants: dict) -> dict:
+    return max(variants.values(), key=lambda variant: variant["width"])
+
+
+def variant_urls(variants: dict) -> dict:
+    """Manifest with absolute urls, as returned to clients."""
+    return {
+        name: {**variant, "urls": {fmt: storage.url(path) for fmt, path in variant["urls"].items()}}
+        for name, variant in variants.items()
+    }
@@ -1,17 +1,201 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
 import redis.asyncio as aioredis  # type: ignore
 
+from ..logger import logging
+from ..utils.bloom import BloomFilter
+
 from .config import settings
+from .metrics import redis_command_duration, redis_command_errors
+
+# sorted set of revoked jti scored by revocation time, used to sync the local filter
+BLOCKLIST_INDEX_KEY = "blocklist:index"
+# seconds re-read below the watermark on every sync, for clock skew between workers
+BLOCKLIST_SYNC_OVERLAP = 5.0
+
+
+class InstrumentedPipeline(aioredis.client.Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        except Exception:
+            redis_command_errors.inc("PIPELINE")
+            raise
+        finally:
+            redis_command_duration.observe(time.perf_counter() - start, "PIPELINE")
+
+
+class InstrumentedRedis(aioredis.Redis):
+    """Redis client recording the latency of every command (and pipeline)."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        command = str(args[0]).upper()
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            redis_command_errors.inc(command)
+            raise
+        finally:
+            redis_command_duration.observe(time.perf_counter() - start, command)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class RedisSessionManager:
+    """Owns one connection pool for the lifetime of the application."""
+
+    def __init__(self, url: str, pool_kwargs: Optional[Dict[str, Any]] = None):
+        self._url = url
+        self._pool_kwargs = dict(pool_kwargs or {})
+        self._pool: Optional[aioredis.ConnectionPool] = None
+        self._client: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def client(self) -> aioredis.Redis:
+        # connections are bound to the loop that opened them, so a pool created
+        # on another loop (e.g. a previous test) is replaced rather than reused
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._pool = aioredis.ConnectionPool.from_url(self._url, **self._pool_kwargs)
+            self._client = InstrumentedRedis(connection_pool=self._pool)
+            self._loop = loop
+
+        return self._client
+
+    async def connect(self) -> None:
+        # open the pool eagerly so the first request doesn't pay for it
+        await self.client.ping()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            await self._pool.aclose()
+
+        self._client = None
+        self._pool = None
+        self._loop = None
+
+
+redismanager = RedisSessionManager(
+    settings.REDIS_URL,
+    {
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+        "retry_on_timeout": True,
+    },
+)
 
-token_blocklist = aioredis.from_url(settings.REDIS_URL)
+
+class BlocklistFilter:
+    """Local Bloom filter of revoked jti, pulled incrementally from Redis.
+
+    A jti that is not in the filter was never revoked (as of the last sync),
+    so only probable hits need a Redis round trip. Until a sync succeeded,
+    or when syncing has stalled, every lookup falls back to Redis.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, ttl: int, max_staleness: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._watermark = 0.0
+        # jti already in the filter that the next sync's overlap may return
+        # again; the filter counts every add, so they must not be re-added
+        self._recent: dict[str, float] = {}
+        self._synced_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._synced_at is not None and time.monotonic() - self._synced_at < self.max_staleness
+
+    def add(self, jti: str) -> None:
+        if jti not in self._recent:
+            self._bloom.add(jti)
+            # revoked just now, so the next sync reads it back
+            self._recent[jti] = time.time()
+
+    def might_contain(self, jti: str) -> bool:
+        return jti in self._bloom
+
+    async def sync(self, client: aioredis.Redis) -> int:
+        now = time.time()
+
+        # forget index entries whose blocklist keys have expired
+        await client.zremrangebyscore(BLOCKLIST_INDEX_KEY, "-inf", now - self.ttl)
+
+        if self._bloom.is_full:
+            # a bloom filter can't drop entries; rebuild from the live index and
+            # swap it in once complete so lookups never see a half-filled filter
+            bloom, watermark, recent = BloomFilter(self.capacity, self.error_rate), 0.0, {}
+        else:
+            bloom, watermark, recent = self._bloom, self._watermark, dict(self._recent)
+
+        # re-read a small overlap to tolerate clock skew between workers
+        since = max(0.0, watermark - BLOCKLIST_SYNC_OVERLAP)
+        entries = await client.zrangebyscore(BLOCKLIST_INDEX_KEY, since, "+inf", withscores=True)
+        added = 0
+        for jti, score in entries:
+            jti = jti.decode() if isinstance(jti, bytes) else jti
+            if jti not in recent:
+                bloom.add(jti)
+                added += 1
+            recent[jti] = score
+            watermark = max(watermark, score)
+
+        # only what the next overlap can return again is worth remembering
+        horizon = watermark - BLOCKLIST_SYNC_OVERLAP
+        recent = {jti: score for jti, score in recent.items() if score >= horizon}
+
+        self._bloom, self._watermark, self._recent = bloom, watermark, recent
+        self._synced_at = time.monotonic()
+        return added
+
+    async def run(self, client_factory, interval: float) -> None:
+        while True:
+            try:
+                await self.sync(client_factory())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # stop trusting the filter until Redis answers again
+                self._synced_at = None
+                logging.error("blocklist sync failed: %s", e)
+
+            await asyncio.sleep(interval)
+
+
+blocklist_filter = BlocklistFilter(
+    capacity=settings.BLOCKLIST_BLOOM_CAPACITY,
+    error_rate=settings.BLOCKLIST_BLOOM_ERROR_RATE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    max_staleness=settings.BLOCKLIST_SYNC_INTERVAL * 3,
+)
 
 
 async def add_jti_to_blocklist(jti: str) -> None:
-    await token_blocklist.set(name=jti, value="", ex=(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60))  # multiply minutes to seconds
-    await token_blocklist.aclose()
+    async with redismanager.client.pipeline(transaction=False) as pipe:
+        pipe.set(name=jti, value="", ex=(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60))  # multiply minutes to seconds
+        pipe.zadd(BLOCKLIST_INDEX_KEY, {jti: time.time()})
+        await pipe.execute()
+
+    blocklist_filter.add(jti)
 
 
 async def token_in_blocklist(jti: str) -> bool:
-    jti = await token_blocklist.get(jti)
-    await token_blocklist.aclose()
+    if settings.BLOCKLIST_BLOOM_ENABLED and blocklist_filter.ready and not blocklist_filter.might_contain(jti):
+        return False
+
+    jti = await redismanager.client.get(jti)
 
     return jti is not None
@@ -1,5 +1,7 @@
 # # Defines functions for authentication.
 
+import hashlib
+import time
 import uuid
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
@@ -10,8 +12,10 @@ import jwt
 from passlib.context import CryptContext
 
 from ..logger import logging
+from ..utils.cache import TTLCache
 
 from .config import settings
+from .executor import BoundedExecutor
 
 
 @dataclass
@@ -24,15 +28,36 @@ setattr(bcrypt, "__about__", SolveBugBcryptWarning())
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow, keep it off the event loop
+password_hasher = BoundedExecutor(
+    "password-hasher",
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+# module level so they can be pickled into a process pool
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
 
 # Hash a password using bcrypt
 async def generate_passwd_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return await password_hasher.run(_hash_password, password)
 
 
 # Check if the provided password matches the stored password (hashed)
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hasher.run(_verify_password, plain_password, hashed_password)
+
+
+# verified claims keyed by token hash, so repeated requests skip HMAC + json parsing
+verified_tokens = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_CACHE_TTL)
 
 
 async def create_url_safe_token(data: dict):
@@ -70,12 +95,24 @@ async def create_access_token(
 
 
 async def decode_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).digest()
+
+    token_data = verified_tokens.get(key)
+    if token_data is not None:
+        return dict(token_data)
+
     try:
         token_data = jwt.decode(
             jwt=token, key=settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
         )
-
-        return token_data
     except jwt.PyJWTError as e:
         logging.error(str(e))
         return None
+
+    # never keep claims past the token's own expiry
+    ttl = settings.TOKEN_CACHE_TTL
+    if "exp" in token_data:
+        ttl = min(ttl, token_data["exp"] - time.time())
+    verified_tokens.set(key, token_data, ttl=ttl)
+
+    return dict(token_data)
@@ -0,0 +1,262 @@
+# Defines where uploaded files are stored: the local filesystem or an S3 compatible bucket.
+
+import asyncio
+import mimetypes
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Any, Optional
+
+from .config import settings
+
+
+class Storage:
+    """Async key/value store of media files.
+
+    Keys are relative paths such as `static/media/images/...`; they are what
+    gets saved in the database and turned into public urls with `url()`.
+    Blocking I/O never runs on the event loop.
+    """
+
+    async def staging_dir(self) -> str:
+        """Scratch directory for spooled uploads and rendered files."""
+        raise NotImplementedError
+
+    async def save_file(self, src: str, key: str, content_type: Optional[str] = None) -> str:
+        """Store the local file `src` under `key`. `src` is consumed."""
+        raise NotImplementedError
+
+    async def save_bytes(self, data: bytes, key: str, content_type: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+    async def read(self, key: str) -> Optional[bytes]:
+        """Content of `key`, None when it doesn't exist."""
+        raise NotImplementedError
+
+    async def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def url(self, key: str) -> str:
+        raise NotImplementedError
+
+
+class LocalStorage(Storage):
+    """Files under `root`, served by the app's /static mount."""
+
+    def __init__(self, root: str, base_url: str, staging: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+        # staged files sit on the same filesystem, so publishing them is a rename
+        self.staging = staging or os.path.join(self.root, ".staging")
+        self._staging_ready = False
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    async def staging_dir(self) -> str:
+        if not self._staging_ready:
+            await asyncio.to_thread(os.makedirs, self.staging, exist_ok=True)
+            self._staging_ready = True
+        return self.staging
+
+    def _move(self, src: str, key: str) -> None:
+        dest = self._path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        # atomic within one filesystem, a copy + delete across filesystems
+        shutil.move(src, dest)
+
+    def _write(self, data: bytes, key: str) -> None:
+        dest = self._path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        # write then rename so readers never see half a file
+        tmp = f"{dest}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, dest)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    async def save_file(self, src: str, key: str, content_type: Optional[str] = None) -> str:
+        await asyncio.to_thread(self._move, src, key)
+        return key
+
+    async def save_bytes(self, data: bytes, key: str, content_type: Optional[str] = None) -> str:
+        await asyncio.to_thread(self._write, data, key)
+        return key
+
+    async def read(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.isfile, self._path(key))
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+class S3Storage(Storage):
+    """Objects in an S3 compatible bucket (AWS, MinIO, R2, ...).
+
+    boto3 is imported on first use, so it's only needed when this backend is
+    configured. Files above `multipart_threshold` are uploaded in
+    `multipart_chunksize` parts, `max_concurrency` of them in parallel.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        public_url: Optional[str] = None,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        multipart_chunksize: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4,
+    ):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.multipart_threshold = multipart_threshold
+        self.multipart_chunksize = multipart_chunksize
+        self.max_concurrency = max_concurrency
+
+        if public_url:
+            self.public_url = public_url.rstrip("/")
+        elif endpoint_url:
+            self.public_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.public_url = f"https://{bucket}.s3.amazonaws.com"
+
+        self._client: Any = None
+        self._transfer_config: Any = None
+
+    @property
+    def client(self) -> Any:
+        # boto3 clients are thread safe: created once here, used from worker threads
+        if self._client is None:
+            import boto3  # type: ignore
+            from boto3.s3.transfer import TransferConfig  # type: ignore
+            from botocore.config import Config  # type: ignore
+
+            self._client = boto3.client(
+                "s3",
+                endpoint_url=self.endpoint_url,
+                region_name=self.region,
+                aws_access_key_id=self.access_key_id,
+                aws_secret_access_key=self.secret_access_key,
+                # one connection per parallel part, plus headroom for small calls
+                config=Config(max_pool_connections=max(10, self.max_concurrency * 2)),
+            )
+            self._transfer_config = TransferConfig(
+                multipart_threshold=self.multipart_threshold,
+                multipart_chunksize=self.multipart_chunksize,
+                max_concurrency=self.max_concurrency,
+                use_threads=True,
+            )
+        return self._client
+
+    @staticmethod
+    def _content_type(key: str, content_type: Optional[str]) -> str:
+        return content_type or mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+    def _is_missing(self, error: Exception) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    async def staging_dir(self) -> str:
+        return tempfile.gettempdir()
+
+    async def save_file(self, src: str, key: str, content_type: Optional[str] = None) -> str:
+        client = self.client
+        await asyncio.to_thread(
+            client.upload_file, src, self.bucket, key,
+            ExtraArgs={"ContentType": self._content_type(key, content_type)},
+            Config=self._transfer_config,
+        )
+        await asyncio.to_thread(os.remove, src)
+        return key
+
+    async def save_bytes(self, data: bytes, key: str, content_type: Optional[str] = None) -> str:
+        client = self.client
+        await asyncio.to_thread(
+            client.put_object, Bucket=self.bucket, Key=key, Body=data,
+            ContentType=self._content_type(key, content_type),
+        )
+        return key
+
+    async def read(self, key: str) -> Optional[bytes]:
+        client = self.client
+
+        def _read() -> Optional[bytes]:
+            try:
+                return client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+            except Exception as e:
+                if self._is_missing(e):
+                    return None
+                raise
+
+        return await asyncio.to_thread(_read)
+
+    async def exists(self, key: str) -> bool:
+        client = self.client
+
+        def _exists() -> bool:
+            try:
+                client.head_object(Bucket=self.bucket, Key=key)
+                return True
+            except Exception as e:
+                if self._is_missing(e):
+                    return False
+                raise
+
+        return await asyncio.to_thread(_exists)
+
+    async def delete(self, key: str) -> None:
+        client = self.client
+        await asyncio.to_thread(client.delete_object, Bucket=self.bucket, Key=key)
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+
+def create_storage(backend: str) -> Storage:
+    if backend == "local":
+        return LocalStorage(settings.STORAGE_LOCAL_ROOT, settings.DOMAIN)
+    if backend == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            # empty env values mean "not set"
+            endpoint_url=settings.S3_ENDPOINT_URL or None,
+            region=settings.S3_REGION or None,
+            access_key_id=settings.S3_ACCESS_KEY_ID or None,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY or None,
+            public_url=settings.S3_PUBLIC_URL,
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNK_SIZE,
+            max_concurrency=settings.S3_MAX_CONCURRENCY,
+        )
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+storage = create_storage(settings.STORAGE_BACKEND)
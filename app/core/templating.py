@@ -0,0 +1,77 @@
+# Defines the email template environment: compiled once, cached on disk, partials inlined.
+
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+# {% include "name" %} with a literal name, the only form that can be inlined
+INCLUDE_RE = re.compile(r"""{%-?\s*include\s+["']([^"']+)["']\s*-?%}""")
+
+
+class InliningLoader(FileSystemLoader):
+    """Pastes included partials into the including template's source.
+
+    The partial's markup then compiles into constants of the parent instead
+    of a template lookup and a nested render on every render. Partials that
+    extend or define blocks keep the regular include.
+    """
+
+    def __init__(self, searchpath: str, inline_prefix: str = "partials/"):
+        super().__init__(searchpath)
+        self.inline_prefix = inline_prefix
+
+    def get_source(self, environment: Environment, template: str) -> Tuple[str, Optional[str], Callable[[], bool]]:
+        source, filename, uptodate = super().get_source(environment, template)
+        checks = [uptodate]
+
+        def inline(match: re.Match) -> str:
+            name = match[1]
+            if not name.startswith(self.inline_prefix):
+                return match[0]
+
+            partial, _, partial_uptodate = self.get_source(environment, name)
+            if "{% extends" in partial or "{% block" in partial:
+                return match[0]
+
+            checks.append(partial_uptodate)
+            return partial
+
+        source = INCLUDE_RE.sub(inline, source)
+        # editing a partial invalidates every template it was pasted into
+        return source, filename, lambda: all(check() for check in checks)
+
+
+class EmailTemplates:
+    """Email templates parsed and compiled once per process.
+
+    Compiled bytecode is also cached in `cache_dir`, keyed by the checksum of
+    the (inlined) source, so a restart or a new worker skips compilation.
+    With `auto_reload` off templates are never re-stat'ed after loading.
+    """
+
+    def __init__(self, directory: str, cache_dir: Optional[str] = None, auto_reload: bool = False):
+        self.directory = directory
+        bytecode_cache = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+        self.env = Environment(
+            loader=InliningLoader(directory),
+            bytecode_cache=bytecode_cache,
+            auto_reload=auto_reload,
+            # every email template stays in memory
+            cache_size=-1,
+        )
+
+    def render(self, template_name: str, context: Dict[str, Any]) -> str:
+        return self.env.get_template(template_name).render(**context)
+
+    def compile_all(self) -> List[str]:
+        """Load every template up front (layouts too), so no request pays for parsing."""
+        names = self.env.list_templates(filter_func=lambda name: name.endswith(".html"))
+        for name in names:
+            self.env.get_template(name)
+        return names
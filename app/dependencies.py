@@ -34,12 +34,21 @@ class TokenBearer(HTTPBearer):
 
         token = creds.credentials
 
-        token_data = await self.token_valid(token)
-        if not token_data:
-            raise InvalidToken()
+        # router level and CurrentUser bearers share the result within one request
+        memo = getattr(request.state, "verified_tokens", None)
+        if memo is None:
+            memo = request.state.verified_tokens = {}
 
-        if await token_in_blocklist(token_data["jti"]):
-            raise InvalidToken()
+        token_data = memo.get(token)
+        if token_data is None:
+            token_data = await self.token_valid(token)
+            if not token_data:
+                raise InvalidToken()
+
+            if await token_in_blocklist(token_data["jti"]):
+                raise InvalidToken()
+
+            memo[token] = token_data
 
         await self.verify_token_data(token_data)
 
@@ -75,8 +84,10 @@ class GetCurrentUser:
     ) -> User:
         user_email = token_details["user"]["email"]
 
+        # stays on the primary: the user is merged into the session that
+        # writes go through, and a lagging replica could miss a status change
         repo = UserRepository(session)
-        user = await UserService(repo).get_by_email(user_email)
+        user = await UserService(repo).get_current_user(user_email)
 
         if user.profile.status_id in [
             settings.STATUS_USER_IN_ACTIVE,
@@ -4,7 +4,7 @@ from ..core.config import settings
 from ..core.database import get_session
 from ..dependencies import AccessTokenBearer, RoleChecker
 
-from . import users_router
+from . import heroes_router, users_router
 
 admin_role_checker = Depends(RoleChecker(["ADMIN"]))
 token_middleware = Depends(AccessTokenBearer())
@@ -16,6 +16,7 @@ router = APIRouter(
 
 
 router.include_router(users_router.router, prefix=f"{settings.API_PREFIX}/users", tags=["admin"])
+router.include_router(heroes_router.router, prefix=f"{settings.API_PREFIX}/heroes", tags=["admin"])
 
 # @router.post("/")
 # async def update_admin():
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.database import get_session
+from ..repositories.hero_repo import HeroRepository
+from ..schemas.bulk_schema import ImportReportSchema
+from ..services.hero_service import HeroService
+from ..utils.importer import ImportFormat
+
+router = APIRouter()
+
+
+async def get_service(session: AsyncSession = Depends(get_session)) -> HeroService:
+    repo = HeroRepository(session)
+    return HeroService(repo)
+
+
+@router.post(
+    "/import",
+    response_model=ImportReportSchema,
+    openapi_extra={"requestBody": {"content": {
+        "text/csv": {"schema": {"type": "string"}},
+        "application/x-ndjson": {"schema": {"type": "string"}},
+    }}},
+)
+async def import_heroes(
+    request: Request,
+    format: ImportFormat = Query("ndjson", description="Format of the raw request body: ndjson or csv"),
+    srv: HeroService = Depends(get_service)
+):
+    # the raw body is consumed as it arrives, never buffered whole
+    return await srv.import_stream(request.stream(), format)
@@ -1,12 +1,14 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, FastAPI, Query, status
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..core.database import get_session
+from ..core.database import get_read_session, get_session, get_stream_session
 from ..repositories.user_repo import UserRepository
 from ..schemas.user_schema import UserSchema
 from ..services.user_service import UserService
+from ..utils.export import ExportFormat, export_response
 from ..utils.pagination import CustomPage
 
 router = APIRouter()
@@ -17,19 +19,35 @@ async def get_service(session: AsyncSession = Depends(get_session)) -> UserServi
     return UserService(repo)
 
 
+async def get_read_service(session: AsyncSession = Depends(get_read_session)) -> UserService:
+    repo = UserRepository(session)
+    return UserService(repo)
+
+
 @router.get("/", response_model=CustomPage[UserSchema])
 async def read_users(
     search: Optional[str] = Query(None, description="Search by name or secret_name", ),
     sorting: Optional[str] = Query(None, description="Sort by Model field e.g. id:desc or name:asc", ),
-    srv: UserService = Depends(get_service)
+    srv: UserService = Depends(get_read_service)
 ):
     return await srv.list(search=search, sorting=sorting)
 
 
+# declared before /{id} so "export" is never parsed as an id
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(
+    format: ExportFormat = Query("ndjson", description="ndjson or csv"),
+    search: Optional[str] = Query(None, description="Only export matching rows", ),
+    session: AsyncSession = Depends(get_stream_session)
+):
+    srv = UserService(UserRepository(session))
+    return export_response(srv.export(search=search), format, "users", on_close=session.close)
+
+
 @router.get("/{id}", response_model=UserSchema)
 async def get_user(
     id: int,
-    srv: UserService = Depends(get_service)
+    srv: UserService = Depends(get_read_service)
 ):
     return await srv.get_by_id(id)
 
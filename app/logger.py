@@ -1,27 +1,190 @@
+# Defines the logging pipeline: callers only queue records, a background
+# listener thread formats them (JSON or text) and writes them out.
+
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
+from datetime import datetime, timezone
+from typing import List, Optional
 
-# get logger
-logger = logging.getLogger()
+from .core.config import settings
+
+ACCESS_LOGGER_NAME = "app.access"
+
+# attributes every LogRecord has, anything else came from `extra=`
+RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, `extra=` fields included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps `rate` of the successful (2xx) access log records, all others pass."""
+
+    def __init__(self, rate: float, logger_name: str = ACCESS_LOGGER_NAME):
+        super().__init__()
+        self.rate = rate
+        self.logger_name = logger_name
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.name != self.logger_name:
+            return True
+
+        status_code = getattr(record, "status_code", None)
+        if status_code is None or not 200 <= status_code < 300:
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread.
+
+    The stock handler formats the message before queueing it, on the
+    caller's thread; here the record is queued as is, so `%` arguments are
+    only interpolated if some handler keeps the record. A full queue drops
+    the record (counted in `dropped`) instead of blocking the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # same process, so the record needs no pickling-friendly flattening
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
-# create formatter
-formater = logging.Formatter(fmt="[%(levelname)s] %(asctime)s %(message)s")
 
+def create_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(fmt="[%(levelname)s] %(asctime)s %(message)s")
+
+
+def create_file_handler(
+    path: str, rotation: str, max_bytes: int, when: str, backup_count: int
+) -> logging.Handler:
+    if rotation == "watch":
+        return logging.handlers.WatchedFileHandler(path)
+    if rotation == "size":
+        return logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+    if rotation == "time":
+        return logging.handlers.TimedRotatingFileHandler(path, when=when, backupCount=backup_count, utc=True)
+    if rotation:
+        raise ValueError(f"Unknown log rotation: {rotation}")
+    return logging.FileHandler(path)
+
+
+def setup_logging(
+    handlers: List[logging.Handler],
+    level: str,
+    sample_rate: float = 1.0,
+    queue_size: int = 0,
+    logger: Optional[logging.Logger] = None,
+) -> logging.handlers.QueueListener:
+    """Route `logger` (root by default) through a queue drained by `handlers`."""
+    logger = logger or logging.getLogger()
+    log_queue: queue.Queue = queue.Queue(queue_size)
+
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    # sampled out records are dropped before they're even queued
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+
+    logger.handlers = [queue_handler]
+    logger.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def restart_after_fork(
+    listener: logging.handlers.QueueListener, logger: Optional[logging.Logger] = None
+) -> logging.handlers.QueueListener:
+    """Give a forked child its own queue and listener thread.
+
+    Only the forking thread survives a fork, so nothing would drain the
+    inherited queue, whose lock the parent's listener may even have held.
+    """
+    logger = logger or logging.getLogger()
+    log_queue: queue.Queue = queue.Queue(listener.queue.maxsize)
+    for handler in logger.handlers:
+        if isinstance(handler, NonBlockingQueueHandler):
+            handler.queue = log_queue
+
+    child = logging.handlers.QueueListener(
+        log_queue, *listener.handlers, respect_handler_level=listener.respect_handler_level
+    )
+    child.start()
+    return child
+
+
+# create formatter
+formatter = create_formatter(settings.LOG_FORMAT)
 
 # create handlers
-stream_handler = logging.StreamHandler(sys.stdout)
-file_handler = logging.FileHandler("logfile.log")
+handlers: List[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+if settings.LOG_FILE:
+    handlers.append(
+        create_file_handler(
+            settings.LOG_FILE,
+            settings.LOG_ROTATION,
+            settings.LOG_MAX_BYTES,
+            settings.LOG_ROTATE_WHEN,
+            settings.LOG_BACKUP_COUNT,
+        )
+    )
 
 # set formatter
-stream_handler.setFormatter(formater)
-file_handler.setFormatter(formater)
+for handler in handlers:
+    handler.setFormatter(formatter)
+
+# get logger
+logger = logging.getLogger()
+listener = setup_logging(handlers, settings.LOG_LEVEL, settings.LOG_ACCESS_SAMPLE_RATE, settings.LOG_QUEUE_SIZE)
+
+
+def _restart_in_child() -> None:
+    global listener
+    listener = restart_after_fork(listener)
+
+
+def stop_logging() -> None:
+    """Write out what's still queued."""
+    listener.stop()
 
-# add handlers to the logger
-logger.handlers = [
-    stream_handler,
-    file_handler
-]
 
+# e.g. gunicorn --preload imports the app once, then forks the workers
+os.register_at_fork(after_in_child=_restart_in_child)
+atexit.register(stop_logging)
 
-# set log-level
-logger.setLevel(logging.WARNING)
+access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
+access_logger.setLevel(settings.LOG_ACCESS_LEVEL)
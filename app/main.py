@@ -1,28 +1,62 @@
 # Initializes the FastAPI application.
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi_pagination import add_pagination
 from fastapi_pagination.api import set_items_transformer
 
 from .core import config
 from .core.database import init_db, sessionmanager
+from .core.email import email_templates
+from .core.redis import blocklist_filter, redismanager
+from .core.security import password_hasher
 from .middleware import register_middleware
 from .routers.base import register_all_routers
+from .utils.file import image_processor
+from .utils.static import CachedStaticFiles
 from .utils.exceptions import register_all_errors
 
-# @asynccontextmanager
-# async def lifespan(app: FastAPI):
-#     # await init_db()
-#     yield
-#     if sessionmanager._engine is not None:
-#         # Close the DB connection
-#         await sessionmanager.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # await init_db()
+    await sessionmanager.warmup(config.settings.DATABASE_POOL_WARMUP)
+    await redismanager.connect()
+    # parse every email template now rather than on the first signup
+    await asyncio.to_thread(email_templates.compile_all)
+
+    blocklist_sync = None
+    if config.settings.BLOCKLIST_BLOOM_ENABLED:
+        blocklist_sync = asyncio.create_task(
+            blocklist_filter.run(lambda: redismanager.client, config.settings.BLOCKLIST_SYNC_INTERVAL)
+        )
+
+    replica_monitor = None
+    if sessionmanager.has_replicas:
+        replica_monitor = asyncio.create_task(
+            sessionmanager.monitor_replicas(config.settings.DATABASE_REPLICA_CHECK_INTERVAL)
+        )
+
+    yield
+
+    if blocklist_sync is not None:
+        blocklist_sync.cancel()
+    if replica_monitor is not None:
+        replica_monitor.cancel()
+    await redismanager.close()
+    if sessionmanager._engine is not None:
+        # Close the DB connection
+        await sessionmanager.close()
+
+    # let running hash and image jobs finish before the worker exits
+    password_hasher.shutdown()
+    image_processor.shutdown()
+
 
 app = FastAPI(
-    # lifespan=lifespan,
+    lifespan=lifespan,
     title=config.settings.OPEN_API_TITLE,
     description=config.settings.OPEN_API_DESCRIPTION,
     version=config.settings.APP_VERSION,
@@ -45,7 +79,7 @@ app = FastAPI(
     redoc_url=f"{config.settings.API_PREFIX}/redoc"
 )
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
 # register all Exceptions
 register_all_errors(app)
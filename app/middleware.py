@@ -1,33 +1,111 @@
+import logging
 import time
 
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from .logger import logger
+from .core.config import settings
+from .core.metrics import http_request_duration, http_requests, http_requests_in_flight
+from .logger import access_logger
 
 
-def register_middleware(app: FastAPI):
+class AccessLogMiddleware:
+    """Logs one access line per HTTP request.
+
+    A plain ASGI middleware: it only wraps `send` to read the status, so
+    unlike `@app.middleware("http")` it adds no extra task or memory
+    streams and streamed responses pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.log(scope, status_code, time.perf_counter_ns() - start)
+
+    @staticmethod
+    def log(scope: Scope, status_code: int, duration_ns: int) -> None:
+        if not access_logger.isEnabledFor(logging.INFO):
+            return
+
+        process_time = duration_ns / 1e9
+        client = scope.get("client") or ("-", 0)
+        path = scope["path"]
+        # set by the router once the request matched, e.g. "/heroes/{hero_id}"
+        route = getattr(scope.get("route"), "path", path)
+        # formatted by the log listener thread, and only if the record is kept
+        access_logger.info(
+            '%s:%s - "%s %s" %s - completed after %s',
+            client[0], client[1], scope["method"], path, status_code, process_time,
+            extra={
+                'url': path,
+                'route': route,
+                'method': scope["method"],
+                'status_code': status_code,
+                'process_time': process_time,
+            },
+        )
 
-    @app.middleware("http")
-    async def custom_logging(request: Request, call_next):
-        start = time.time()
 
-        response = await call_next(request)
+def route_label(scope: Scope) -> str:
+    """Route template of a handled request; never the raw path, which is unbounded."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # a mounted app (e.g. /static) sets root_path to its mount point
+    if "endpoint" in scope:
+        return f"{scope.get('root_path', '')}/{{path}}"
+    return "unmatched"
 
-        process_time = time.time() - start
-        log_dict = {
-            'url': request.url.path,
-            'method': request.method,
-            'process_time': process_time,
-        }
-        message = f'{request.client.host}:{request.client.port} - "{request.method} {request.url.path}" {response.status_code} - completed after {process_time}'
 
-        # print(message)
-        logger.info(message, extra=log_dict)
+class MetricsMiddleware:
+    """Records request latency, status and in-flight requests (see core.metrics)."""
 
-        return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            method, route = scope["method"], route_label(scope)
+            http_request_duration.observe((time.perf_counter_ns() - start) / 1e9, method, route)
+            http_requests.inc(method, route, str(status_code))
+
+
+def register_middleware(app: FastAPI):
 
     origins = [
         "http://localhost:8000",
@@ -47,3 +125,9 @@ def register_middleware(app: FastAPI):
     )
 
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=allowed_hosts)
+
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    # outermost, so the timing covers the other middleware too
+    app.add_middleware(AccessLogMiddleware)
@@ -1,4 +1,5 @@
 from .base import *
+from .email_outbox import *
 from .hero import *
 from .hero_publisher import *
 from .status import *
@@ -8,6 +8,9 @@ class BaseModel(SQLModel):
     """Base SQL model class.
     """
 
+    # fetch server generated values with RETURNING at flush instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     id: int | None = Field(default=None, primary_key=True)
     created_at: Optional[datetime] = Field(
         default_factory=lambda: datetime.now()
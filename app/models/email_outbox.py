@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlmodel import JSON, Column, Field
+
+from .base import BaseModel
+
+
+class EmailOutbox(BaseModel, table=True):
+    __tablename__ = 'email_outbox'
+
+    subject: str
+    recipients: List[str] = Field(sa_column=Column(JSON, nullable=False))
+    template_name: str
+    body: dict = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+
+    # pending -> sent, or failed once max attempts are used up
+    status: str = Field(default="pending", index=True)
+    attempts: int = 0
+    # due time of the next attempt, also pushed forward while a worker holds the row
+    next_attempt_at: datetime = Field(default_factory=lambda: datetime.now(), index=True)
+    last_error: Optional[str] = None
+    sent_at: Optional[datetime] = None
@@ -14,7 +14,8 @@ class HeroPublisher(BaseModel, table=True):
 
     name: str = Field(index=True)
 
+    # back-reference: never loaded unless a query asks for it
     heroes: List["Hero"] = Relationship(
-        back_populates="hero_publisher", cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="hero_publisher", cascade_delete=True, passive_deletes=True,
+        sa_relationship_kwargs={"lazy": "noload"}
     )
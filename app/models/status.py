@@ -15,7 +15,8 @@ class Status(BaseModel, table=True):
 
     name: str = Field(index=True, unique=True)
 
+    # back-reference: never loaded unless a query asks for it
     user_profiles: List["UserProfile"] = Relationship(
-        back_populates="status", cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="status", cascade_delete=True, passive_deletes=True,
+        sa_relationship_kwargs={"lazy": "noload"}
     )
@@ -2,7 +2,7 @@ from datetime import date, datetime
 from typing import TYPE_CHECKING, Annotated, List, Optional
 
 from pydantic import EmailStr, field_validator
-from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel import JSON, Column, Field, Relationship, SQLModel
 
 from .base import BaseModel
 from .status import Status
@@ -16,13 +16,16 @@ class UserProfile(BaseModel, table=True):
 
     phone: str | None = None
     photo: str | None = None
+    # size name -> {width, height, urls: {format: path}} of the photo variants
+    photo_variants: dict | None = Field(default=None, sa_column=Column(JSON))
     role: str | None = None
     birthday: date | None = None
 
     user_id: int | None = Field(default=None, foreign_key="users.id", ondelete="CASCADE")
+    # back-reference: never loaded unless a query asks for it
     user: "User" = Relationship(
         back_populates="profile",
-        sa_relationship_kwargs={"lazy": "selectin"}
+        sa_relationship_kwargs={"lazy": "noload"}
     )
 
     status_id: int | None = Field(default=None, foreign_key="status.id", ondelete="CASCADE")
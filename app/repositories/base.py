@@ -1,21 +1,44 @@
+import contextlib
 import uuid
-from typing import Any, Dict, Generic, List, Sequence, Type, TypeVar
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Sequence, Type, TypeVar
 
-from fastapi_pagination.ext.sqlalchemy import paginate
+from fastapi_pagination import create_page, resolve_params
+from sqlalchemy import Integer, any_, bindparam, delete, insert, update
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import MANYTOONE
+from sqlalchemy.sql import text
 from sqlalchemy.sql.expression import Executable
-from sqlmodel import func, select
+from sqlmodel import and_, func, or_, select
 from sqlmodel.sql.expression import SelectOfScalar
 
+from ..core.cache import count_cache
+from ..core.config import settings
 from ..services.base import SessionMixin
+from ..utils.pagination import decode_cursor, encode_cursor, invalid_cursor
+from ..utils.search import get_search_backend
+from ..utils.validation import parseSorting
 
 
 class BaseRepository(SessionMixin):
     """Base repository class responsible for operations over database."""
 
+    # loader options applied by the repository's queries
+    load_options: tuple = ()
+
+    @property
+    def dialect_name(self) -> str:
+        return self.session.bind.dialect.name
+
+    def search(self, statement: SelectOfScalar, columns: Sequence[Any], term: str) -> SelectOfScalar:
+        backend = get_search_backend(self.dialect_name, settings.SEARCH_BACKEND)
+        return backend.apply(statement, columns, term)
+
     async def get_count(self, q: SelectOfScalar) -> int:
         count = await self.session.scalar(
-            select(func.count()).select_from(q.subquery())
+            select(func.count()).select_from(q.order_by(None).subquery())
         )
         # print(count)
         return count if count is not None else 0
@@ -27,8 +50,124 @@ class BaseRepository(SessionMixin):
     #         return count
     #     return 0
 
-    async def get_all(self, statement: Executable) -> List[Any]:
-        return await paginate(conn=self.session, query=statement)
+    async def get_all(self, statement: SelectOfScalar, sorting: Optional[str] = None) -> List[Any]:
+        params = resolve_params()
+        model = statement.column_descriptions[0]["entity"]
+
+        if getattr(params, "is_cursor", False):
+            return await self.get_keyset_page(statement, model, sorting, params)
+
+        total, total_strategy = await self.get_total(
+            statement, model, params.count or settings.PAGINATION_COUNT_STRATEGY
+        )
+
+        if sorting:
+            # an explicit sort replaces any ordering set by the search backend; the
+            # column (not raw text) keeps it unambiguous next to joined eager loads
+            field, desc = parseSorting(model, sorting)
+            sort_col = getattr(model, field)
+            statement = statement.order_by(None).order_by(sort_col.desc() if desc else sort_col.asc())
+
+        raw_params = params.to_raw_params()
+        result = await self.session.exec(statement.limit(raw_params.limit).offset(raw_params.offset))
+
+        return create_page(result.all(), total=total, params=params, total_strategy=total_strategy)
+
+    async def get_total(self, statement: SelectOfScalar, model: Any, strategy: str) -> tuple[int, str]:
+        """Count rows of a list query, returning the total and the strategy actually used."""
+        table = model.__tablename__
+
+        if strategy == "estimate":
+            # the planner's row estimate is only meaningful for the whole table
+            if statement.whereclause is None and self.dialect_name == "postgresql":
+                estimate = await self.session.scalar(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                    params={"table": table},
+                )
+                # -1 until the table has been vacuumed/analyzed
+                if estimate is not None and estimate >= 0:
+                    return int(estimate), "estimate"
+
+            strategy = "cached"
+
+        if strategy == "cached":
+            compiled = statement.compile()
+            signature = (str(compiled), repr(sorted(compiled.params.items())))
+
+            total = count_cache.get(table, signature)
+            if total is None:
+                total = await self.get_count(statement)
+                count_cache.set(table, signature, total)
+
+            return total, "cached"
+
+        return await self.get_count(statement), "exact"
+
+    async def get_keyset_page(self, statement: SelectOfScalar, model: Any, sorting: Optional[str], params: Any) -> Any:
+        """Seek past the last row of the previous page instead of OFFSET, without a total count."""
+        field, desc = parseSorting(model, sorting) if sorting else ("id", False)
+        sort_col = getattr(model, field)
+        id_col = model.id
+
+        # nulls always sort last so the seek condition is the same on every dialect
+        statement = statement.order_by(None)
+        if desc:
+            statement = statement.order_by(sort_col.desc().nulls_last(), id_col.desc())
+        else:
+            statement = statement.order_by(sort_col.asc().nulls_last(), id_col.asc())
+
+        if params.cursor:
+            last_value, last_id = decode_cursor(params.cursor, 2)
+            try:
+                last_value = self._cursor_value(sort_col, last_value)
+                last_id = int(last_id)
+            except (TypeError, ValueError):
+                raise invalid_cursor()
+            after = (lambda c, v: c < v) if desc else (lambda c, v: c > v)
+
+            if last_value is None:
+                statement = statement.where(and_(sort_col.is_(None), after(id_col, last_id)))
+            else:
+                statement = statement.where(or_(
+                    after(sort_col, last_value),
+                    and_(sort_col == last_value, after(id_col, last_id)),
+                    sort_col.is_(None),
+                ))
+
+        # one extra row tells whether another page exists
+        result = await self.session.exec(statement.limit(params.size + 1))
+        items = list(result.all())
+
+        next_cursor = None
+        if len(items) > params.size:
+            items = items[:params.size]
+            last = items[-1]
+            next_cursor = encode_cursor([getattr(last, field), last.id])
+
+        return create_page(items, total=None, params=params, next_cursor=next_cursor)
+
+    @staticmethod
+    def _cursor_value(column: Any, value: Any) -> Any:
+        # json round trip turns dates into strings, restore the column's python type
+        if value is None:
+            return None
+
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:  # pragma: no cover
+            return value
+
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        return python_type(value)
+
+    async def stream(self, statement: SelectOfScalar, batch_size: int) -> AsyncIterator[Any]:
+        """Iterate rows through a server-side cursor, `batch_size` rows per fetch."""
+        result = await self.session.stream_scalars(statement.execution_options(yield_per=batch_size))
+        async for obj in result:
+            yield obj
 
     async def get_one(self, statement: Executable) -> Any:
         result = await self.session.exec(statement)
@@ -36,21 +175,184 @@ class BaseRepository(SessionMixin):
 
         return obj if obj is not None else None
 
+    @property
+    def in_unit_of_work(self) -> bool:
+        return self.session.info.get("unit_of_work", 0) > 0
+
+    @contextlib.asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator["BaseRepository"]:
+        """Group writes into one transaction.
+
+        Inside the block `add_one`, `add_all` and `delete_one` only flush;
+        the outermost block commits once on exit and rolls back on error.
+        State lives on the session, so repositories sharing it share the unit.
+        """
+        info = self.session.info
+        outer = not self.in_unit_of_work
+        if outer:
+            info["unit_of_work_tables"] = set()
+        info["unit_of_work"] = info.get("unit_of_work", 0) + 1
+
+        try:
+            yield self
+
+            if outer:
+                await self.session.commit()
+                for table in info["unit_of_work_tables"]:
+                    count_cache.invalidate(table)
+        except Exception:
+            if outer:
+                await self.session.rollback()
+            raise
+        finally:
+            info["unit_of_work"] -= 1
+
+    def _stale_relationships(self) -> List[tuple]:
+        """Relationships of pending/dirty objects that won't match the row after a flush.
+
+        That is any not-yet-loaded relationship, or a many-to-one whose
+        foreign key was assigned directly. `noload` back-references are skipped.
+        """
+        stale = []
+        for obj in list(self.session.new) + list(self.session.dirty):
+            state = sa_inspect(obj)
+            names = []
+            for rel in state.mapper.relationships:
+                if rel.lazy == "noload":
+                    continue
+
+                if rel.key in state.unloaded or (
+                    rel.direction is MANYTOONE
+                    and any(state.attrs[col.key].history.has_changes() for col in rel.local_columns)
+                ):
+                    names.append(rel.key)
+
+            if names:
+                stale.append((obj, names))
+
+        return stale
+
+    async def save(self) -> None:
+        """Flush (inside a unit of work) or commit pending changes.
+
+        Columns come back through RETURNING / eager defaults, so instead of a
+        full refresh only the stale relationships are reloaded.
+        """
+        stale = self._stale_relationships()
+        tables = {
+            obj.__tablename__
+            for obj in list(self.session.new) + list(self.session.dirty) + list(self.session.deleted)
+        }
+
+        if self.in_unit_of_work:
+            await self.session.flush()
+            self.session.info["unit_of_work_tables"].update(tables)
+        else:
+            await self.session.commit()
+            for table in tables:
+                count_cache.invalidate(table)
+
+        for obj, names in stale:
+            await self.session.refresh(obj, attribute_names=names)
+
+    def touch(self, *tables: str) -> None:
+        """Mark tables written outside the ORM unit (bulk statements) for count invalidation."""
+        if self.in_unit_of_work:
+            self.session.info["unit_of_work_tables"].update(tables)
+        else:
+            for table in tables:
+                count_cache.invalidate(table)
+
+    def id_in(self, model: Any, ids: Sequence[int]) -> Any:
+        # one array parameter on Postgres keeps a single prepared statement for any batch size
+        if self.dialect_name == "postgresql":
+            return model.id == any_(bindparam("ids", list(ids), type_=ARRAY(Integer)))
+        return model.id.in_(list(ids))
+
+    async def existing_ids(self, model: Any, ids: Sequence[int]) -> set:
+        if not ids:
+            return set()
+
+        result = await self.session.exec(select(model.id).where(self.id_in(model, ids)))
+        return set(result.all())
+
+    async def get_many(self, model: Any, ids: Sequence[int]) -> List[Any]:
+        """Rows by id with the repository's loader options, in the order of `ids`.
+
+        Loaded objects are overwritten, since bulk statements bypass the identity map.
+        """
+        if not ids:
+            return []
+
+        stmt = (
+            select(model).where(self.id_in(model, ids)).options(*self.load_options)
+            .execution_options(populate_existing=True)
+        )
+        rows = {row.id: row for row in (await self.session.exec(stmt)).all()}
+        return [rows[id] for id in ids if id in rows]
+
+    async def insert_many(self, model: Any, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert all rows as batched multi-row INSERT ... RETURNING, ids in row order."""
+        if not rows:
+            return []
+
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        result = await self.session.exec(stmt, params=rows)
+        self.touch(model.__tablename__)
+        return list(result.scalars().all())
+
+    async def copy_many(self, model: Any, rows: List[Dict[str, Any]]) -> int:
+        """Load rows without returning anything: COPY on asyncpg, batched executemany elsewhere."""
+        if not rows:
+            return 0
+
+        if self.session.bind.dialect.driver == "asyncpg":
+            columns = list(rows[0])
+            conn = await self.session.connection()
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                model.__tablename__,
+                records=[tuple(row[column] for column in columns) for row in rows],
+                columns=columns,
+            )
+        else:
+            await self.session.exec(insert(model), params=rows)
+
+        self.touch(model.__tablename__)
+        return len(rows)
+
+    async def update_many(self, model: Any, rows: List[Dict[str, Any]]) -> None:
+        """UPDATE by primary key as one executemany; every row carries its `id`."""
+        if not rows:
+            return
+
+        await self.session.exec(update(model), params=rows)
+        self.touch(model.__tablename__)
+
+    async def delete_many(self, model: Any, ids: Sequence[int]) -> List[int]:
+        """DELETE in one statement, returns the ids that existed."""
+        if not ids:
+            return []
+
+        stmt = delete(model).where(self.id_in(model, ids)).returning(model.id)
+        result = await self.session.exec(stmt, execution_options={"synchronize_session": False})
+        self.touch(model.__tablename__)
+        return list(result.scalars().all())
+
     async def add_one(self, model: Any) -> None:
         self.session.add(model)
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self.save()
 
         return model
 
     async def add_all(self, models: Sequence[Any]) -> List[Any]:
         self.session.add_all(models)
-        await self.session.commit()
-        # await self.session.refresh(models)
+        await self.save()
+
         return models
 
     async def delete_one(self, model: Any) -> None:
         await self.session.delete(model)
-        await self.session.commit()
+        await self.save()
 
         return model
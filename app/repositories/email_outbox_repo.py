@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import select
+
+from ..models import EmailOutbox
+from ..schemas.email_schema import EmailSchema
+
+from .base import BaseRepository
+
+
+class EmailOutboxRepository(BaseRepository):
+
+    async def enqueue(self, email: EmailSchema, template_name: str) -> EmailOutbox:
+        """Store an email for the worker.
+
+        Inside a unit of work it is only flushed, so it commits (or rolls
+        back) together with the caller's other changes.
+        """
+        obj = EmailOutbox(
+            subject=email.subject,
+            recipients=[str(address) for address in email.emails],
+            template_name=template_name,
+            body=jsonable_encoder(email.body),
+        )
+        return await self.add_one(obj)
+
+    async def claim(self, limit: int, lease: float) -> List[EmailOutbox]:
+        """Take a batch of due emails for one worker.
+
+        Claimed rows are moved `lease` seconds into the future, so they are
+        only picked up again if this worker dies before reporting back.
+        """
+        now = datetime.now()
+        stmt = (
+            select(EmailOutbox)
+            .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+        )
+        if self.dialect_name == "postgresql":
+            # concurrent workers skip each other's rows instead of waiting on them
+            stmt = stmt.with_for_update(skip_locked=True)
+
+        rows = list((await self.session.exec(stmt)).all())
+        for row in rows:
+            row.attempts += 1
+            row.next_attempt_at = now + timedelta(seconds=lease)
+
+        await self.session.commit()
+        return rows
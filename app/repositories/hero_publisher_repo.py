@@ -1,41 +1,51 @@
 
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import status
+from sqlalchemy import delete
+from sqlalchemy.orm import noload, selectinload
 from sqlalchemy.sql import text
 from sqlmodel import Field, Session, SQLModel, and_, col, or_, select
 
-from ..models import HeroPublisher
-from ..schemas.hero_publisher_schema import HeroPublisherCreateSchema, HeroPublisherUpdateSchema
+from ..core.config import settings
+from ..models import Hero, HeroPublisher
+from ..schemas.hero_publisher_schema import (HeroPublisherBulkUpdateSchema, HeroPublisherCreateSchema,
+                                             HeroPublisherUpdateSchema)
 from ..utils.exceptions import ResponseException
-from ..utils.validation import formatSorting
 
 from .base import BaseRepository
 
 
 class HeroPublisherRepository(BaseRepository):
+    # HeroPublisherSchema has no heroes, a page must never pull the hero table
+    load_options = (noload(HeroPublisher.heroes),)
+
     async def list(
         self,
         search: Optional[str] = None,
         sorting: Optional[str] = None
     ) -> List[HeroPublisher]:
         """Retrieve all data."""
-        stmt = select(HeroPublisher)
+        stmt = select(HeroPublisher).options(*self.load_options)
 
         if search:
-            stmt = stmt.where(
-                col(HeroPublisher.name).icontains(search),
-            )
+            stmt = self.search(stmt, [HeroPublisher.name], search)
+
+        return await self.get_all(stmt, sorting=sorting)
+
+    def export(self, search: Optional[str] = None) -> AsyncIterator[HeroPublisher]:
+        """Stream all data ordered by ID, for exports."""
+        stmt = select(HeroPublisher).options(*self.load_options)
 
-        if sorting:
-            xSort = formatSorting(HeroPublisher, sorting)
-            stmt = stmt.order_by(text(xSort))
+        if search:
+            stmt = self.search(stmt, [HeroPublisher.name], search)
 
-        return await self.get_all(stmt)
+        return self.stream(stmt.order_by(None).order_by(HeroPublisher.id), settings.EXPORT_BATCH_SIZE)
 
-    async def get_by_id(self, id: int) -> Optional[HeroPublisher]:
+    async def get_by_id(self, id: int, options: Optional[tuple] = None) -> Optional[HeroPublisher]:
         """Retrieve a data by its ID."""
-        stmt = select(HeroPublisher).where(HeroPublisher.id == id)
+        stmt = select(HeroPublisher).where(HeroPublisher.id == id).options(*(options or self.load_options))
         res = await self.get_one(stmt)
 
         if res is None:
@@ -71,5 +81,53 @@ class HeroPublisherRepository(BaseRepository):
 
     async def delete(self, id: int) -> None:
         """Delete data."""
-        data_db = await self.get_by_id(id)
+        # load the heroes so the ORM cascade also works where the FK has no ON DELETE (SQLite)
+        data_db = await self.get_by_id(id, options=(selectinload(HeroPublisher.heroes),))
         return await self.delete_one(data_db)
+
+    async def bulk_create(
+        self, items: List[Tuple[int, HeroPublisherCreateSchema]]
+    ) -> Tuple[List[HeroPublisher], List[Dict]]:
+        """Add many data in one INSERT."""
+        # validate like `create` so the model's default factories fill the timestamps
+        rows = [HeroPublisher.model_validate(obj).model_dump(exclude={"id"}) for _, obj in items]
+
+        async with self.unit_of_work():
+            ids = await self.insert_many(HeroPublisher, rows)
+
+        return await self.get_many(HeroPublisher, ids), []
+
+    async def bulk_edit(
+        self, items: List[Tuple[int, HeroPublisherBulkUpdateSchema]]
+    ) -> Tuple[List[HeroPublisher], List[Dict]]:
+        """Edit many data in one executemany UPDATE."""
+        existing = await self.existing_ids(HeroPublisher, [obj.id for _, obj in items])
+
+        rows, errors = [], []
+        for index, obj in items:
+            if obj.id not in existing:
+                errors.append({"index": index, "id": obj.id, "detail": f"Hero Publisher with ID {obj.id} not found"})
+                continue
+            rows.append({**obj.model_dump(exclude_unset=True), "updated_at": datetime.now()})
+
+        async with self.unit_of_work():
+            await self.update_many(HeroPublisher, rows)
+
+        return await self.get_many(HeroPublisher, [row["id"] for row in rows]), errors
+
+    async def bulk_delete(self, ids: List[int]) -> Tuple[List[int], List[Dict]]:
+        """Delete many data in one DELETE."""
+        async with self.unit_of_work():
+            # the statement skips the ORM cascade, remove heroes first where the FK can't (SQLite)
+            await self.session.exec(
+                delete(Hero).where(Hero.hero_publisher_id.in_(ids)),
+                execution_options={"synchronize_session": False},
+            )
+            self.touch(Hero.__tablename__)
+            deleted = await self.delete_many(HeroPublisher, ids)
+
+        errors = [
+            {"index": index, "id": id, "detail": f"Hero Publisher with ID {id} not found"}
+            for index, id in enumerate(ids) if id not in deleted
+        ]
+        return deleted, errors
@@ -1,44 +1,49 @@
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import status
+from sqlalchemy.orm import joinedload
 from sqlalchemy.sql import text
 from sqlmodel import Field, Session, SQLModel, and_, col, or_, select
 
-from ..models import Hero
-from ..schemas.hero_schema import HeroCreateSchema, HeroUpdateSchema
+from ..core.config import settings
+from ..models import Hero, HeroPublisher
+from ..schemas.hero_schema import HeroBulkUpdateSchema, HeroCreateSchema, HeroUpdateSchema
 from ..utils.exceptions import ResponseException
-from ..utils.validation import formatSorting
 
 from .base import BaseRepository
 
 
 class HeroRepository(BaseRepository):
+    # HeroSchema renders the publisher; many-to-one, so join it in the same query
+    load_options = (joinedload(Hero.hero_publisher),)
+
     async def list(
         self,
         search: Optional[str] = None,
         sorting: Optional[str] = None
     ) -> List[Hero]:
         """Retrieve all data."""
-        stmt = select(Hero)
+        stmt = select(Hero).options(*self.load_options)
 
         if search:
-            stmt = stmt.where(
-                or_(
-                    col(Hero.name).icontains(search),
-                    col(Hero.secret_name).icontains(search),
-                )
-            )
+            stmt = self.search(stmt, [Hero.name, Hero.secret_name], search)
+
+        return await self.get_all(stmt, sorting=sorting)
 
-        if sorting:
-            xSort = formatSorting(Hero, sorting)
-            stmt = stmt.order_by(text(xSort))
+    def export(self, search: Optional[str] = None) -> AsyncIterator[Hero]:
+        """Stream all data ordered by ID, for exports."""
+        stmt = select(Hero).options(*self.load_options)
 
-        return await self.get_all(stmt)
+        if search:
+            stmt = self.search(stmt, [Hero.name, Hero.secret_name], search)
+
+        return self.stream(stmt.order_by(None).order_by(Hero.id), settings.EXPORT_BATCH_SIZE)
 
     async def get_by_id(self, id: int) -> Optional[Hero]:
         """Retrieve a data by its ID."""
-        stmt = select(Hero).where(Hero.id == id)
+        stmt = select(Hero).where(Hero.id == id).options(*self.load_options)
         res = await self.get_one(stmt)
 
         if res is None:
@@ -76,3 +81,71 @@ class HeroRepository(BaseRepository):
         """Delete data."""
         hero_db = await self.get_by_id(id)
         return await self.delete_one(hero_db)
+
+    async def check_publishers(self, items: List[Tuple[int, Any]]) -> Tuple[List[Tuple[int, Any]], List[Dict]]:
+        """Split bulk items by whether the publisher they reference exists."""
+        publisher_ids = {obj.hero_publisher_id for _, obj in items if obj.hero_publisher_id is not None}
+        existing = await self.existing_ids(HeroPublisher, publisher_ids)
+
+        valid, errors = [], []
+        for index, obj in items:
+            if obj.hero_publisher_id is not None and obj.hero_publisher_id not in existing:
+                errors.append({
+                    "index": index,
+                    "id": getattr(obj, "id", None),
+                    "detail": f"Hero Publisher with ID {obj.hero_publisher_id} not found",
+                })
+            else:
+                valid.append((index, obj))
+
+        return valid, errors
+
+    async def bulk_create(self, items: List[Tuple[int, HeroCreateSchema]]) -> Tuple[List[Hero], List[Dict]]:
+        """Add many data in one INSERT."""
+        items, errors = await self.check_publishers(items)
+        # validate like `create` so the model's default factories fill the timestamps
+        rows = [Hero.model_validate(obj).model_dump(exclude={"id"}) for _, obj in items]
+
+        async with self.unit_of_work():
+            ids = await self.insert_many(Hero, rows)
+
+        return await self.get_many(Hero, ids), errors
+
+    async def bulk_edit(self, items: List[Tuple[int, HeroBulkUpdateSchema]]) -> Tuple[List[Hero], List[Dict]]:
+        """Edit many data in one executemany UPDATE."""
+        items, errors = await self.check_publishers(items)
+        existing = await self.existing_ids(Hero, [obj.id for _, obj in items])
+
+        rows = []
+        for index, obj in items:
+            if obj.id not in existing:
+                errors.append({"index": index, "id": obj.id, "detail": f"Hero with ID {obj.id} not found"})
+                continue
+            rows.append({**obj.model_dump(exclude_unset=True), "updated_at": datetime.now()})
+
+        async with self.unit_of_work():
+            await self.update_many(Hero, rows)
+
+        return await self.get_many(Hero, [row["id"] for row in rows]), errors
+
+    async def bulk_delete(self, ids: List[int]) -> Tuple[List[int], List[Dict]]:
+        """Delete many data in one DELETE."""
+        async with self.unit_of_work():
+            deleted = await self.delete_many(Hero, ids)
+
+        errors = [
+            {"index": index, "id": id, "detail": f"Hero with ID {id} not found"}
+            for index, id in enumerate(ids) if id not in deleted
+        ]
+        return deleted, errors
+
+    async def import_rows(self, items: List[Tuple[int, HeroCreateSchema]]) -> Tuple[int, List[Dict]]:
+        """Load one batch of validated rows in its own transaction."""
+        items, errors = await self.check_publishers(items)
+        # validate like `create` so the model's default factories fill the timestamps
+        rows = [Hero.model_validate(obj).model_dump(exclude={"id"}) for _, obj in items]
+
+        async with self.unit_of_work():
+            imported = await self.copy_many(Hero, rows)
+
+        return imported, errors
@@ -1,50 +1,52 @@
 
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from fastapi import status
+from sqlalchemy.orm import joinedload
 from sqlalchemy.sql import text
 from sqlmodel import Field, Session, SQLModel, and_, col, or_, select
 
+from ..core.cache import user_cache
 from ..core.config import settings
 from ..core.security import generate_passwd_hash
 from ..models import User, UserProfile
 from ..schemas.auth_schema import PasswordResetConfirmSchema
 from ..schemas.user_schema import UserCreateSchema, UserSchema, UserUpdateSchema
 from ..utils.exceptions import (UserAlreadyExists, UsernameAlreadyExists, UserNotFound)
-from ..utils.validation import formatSorting
 
 from .base import BaseRepository
 
 
 class UserRepository(BaseRepository):
+    # UserSchema renders profile and its status; both one-to-one from the user
+    load_options = (joinedload(User.profile).joinedload(UserProfile.status),)
+
     async def list(
         self,
         search: Optional[str] = None,
         sorting: Optional[str] = None
     ) -> List[User]:
         """Retrieve all data."""
-        stmt = select(User)
+        stmt = select(User).options(*self.load_options)
 
         if search:
-            stmt = stmt.where(
-                or_(
-                    col(User.first_name).icontains(search),
-                    col(User.last_name).icontains(search),
-                    col(User.email).icontains(search),
-                    col(User.username).icontains(search),
-                )
-            )
+            stmt = self.search(stmt, [User.first_name, User.last_name, User.email, User.username], search)
+
+        return await self.get_all(stmt, sorting=sorting)
+
+    def export(self, search: Optional[str] = None) -> AsyncIterator[User]:
+        """Stream all data ordered by ID, for exports."""
+        stmt = select(User).options(*self.load_options)
 
-        if sorting:
-            xSort = formatSorting(User, sorting)
-            stmt = stmt.order_by(text(xSort))
+        if search:
+            stmt = self.search(stmt, [User.first_name, User.last_name, User.email, User.username], search)
 
-        return await self.get_all(stmt)
+        return self.stream(stmt.order_by(None).order_by(User.id), settings.EXPORT_BATCH_SIZE)
 
     async def get_by_id(self, id: int) -> Optional[User]:
         """Retrieve a data by its ID."""
-        stmt = select(User).where(User.id == id)
+        stmt = select(User).where(User.id == id).options(*self.load_options)
         res = await self.get_one(stmt)
 
         if res is None:
@@ -60,18 +62,14 @@ class UserRepository(BaseRepository):
         # generate hashed password
         db_dict.password = await generate_passwd_hash(obj.password)
 
-        user = await self.add_one(db_dict)
-
-        # auto create user profile
-        await self.add_one(
-            UserProfile(**{
-                "role": "User",
-                "user_id": user.id,
-                "status_id": 3,  # Pending
-            })
-        )
+        # auto create user profile, inserted with the user in a single flush
+        db_dict.profile = UserProfile(**{
+            "role": "User",
+            "status_id": 3,  # Pending
+        })
 
-        await self.session.refresh(user)
+        user = await self.add_one(db_dict)
+        await self.invalidate_cache(user)
 
         # fix Pydantic serializer warnings Expected `str` but got `bytes`
         # convert bytes password to str password
@@ -90,24 +88,49 @@ class UserRepository(BaseRepository):
 
         # process save data
         res = await self.add_one(data_db)
+        await self.invalidate_cache(res)
         return res
 
     async def delete(self, id: int) -> None:
         """Delete data."""
         data_db = await self.get_by_id(id)
-        return await self.delete_one(data_db)
+        res = await self.delete_one(data_db)
+        await self.invalidate_cache(data_db)
+        return res
 
     async def get_by_email(self, email: str) -> Optional[User]:
-        stmt = select(User).where(User.email == email)
+        stmt = select(User).where(User.email == email).options(*self.load_options)
+        res = await self.get_one(stmt)
+
+        if res is None:
+            raise UserNotFound()
+
+        return res
+
+    async def get_by_email_cached(self, email: str) -> User:
+        """Retrieve a user by email, served from the user cache when possible."""
+        if not settings.USER_CACHE_ENABLED:
+            return await self.get_by_email(email)
+
+        cached = await user_cache.get(email)
+        if cached is not None:
+            # attach the cached copy to this session without a SELECT
+            return await self.session.merge(cached, load=False)
+
+        stmt = select(User).where(User.email == email).options(*self.load_options)
         res = await self.get_one(stmt)
 
         if res is None:
             raise UserNotFound()
 
+        await user_cache.set(res)
         return res
 
+    async def invalidate_cache(self, user: User) -> None:
+        await user_cache.invalidate(user.email)
+
     async def get_by_username(self, username: str) -> Optional[User]:
-        stmt = select(User).where(User.username == username)
+        stmt = select(User).where(User.username == username).options(*self.load_options)
         res = await self.get_one(stmt)
 
         if res is None:
@@ -138,7 +161,9 @@ class UserRepository(BaseRepository):
         user.profile.status_id = settings.STATUS_USER_ACTIVE
 
         # process update data
-        return await self.add_one(user)
+        res = await self.add_one(user)
+        await self.invalidate_cache(res)
+        return res
 
     async def reset_password(self, user: User, payload: PasswordResetConfirmSchema) -> User:
         # validate basemodel
@@ -148,7 +173,9 @@ class UserRepository(BaseRepository):
         user.password = await generate_passwd_hash(payload.new_password)
 
         # process save data
-        return await self.add_one(user)
+        res = await self.add_one(user)
+        await self.invalidate_cache(res)
+        return res
 
     async def update_profile(self, user: User, payload: UserUpdateSchema) -> User:
         # prepare update user
@@ -159,11 +186,16 @@ class UserRepository(BaseRepository):
             user.profile.sqlmodel_update(payload.profile.model_dump(exclude_unset=True))
 
         # process save user
-        return await self.add_one(user)
+        res = await self.add_one(user)
+        await self.invalidate_cache(res)
+        return res
 
-    async def update_photo_profile(self, user: User, file_path: str) -> User:
+    async def update_photo_profile(self, user: User, file_path: str, variants: Optional[dict] = None) -> User:
 
         user.profile.photo = file_path
+        user.profile.photo_variants = variants
 
         # process save
-        return await self.add_one(user)
+        res = await self.add_one(user)
+        await self.invalidate_cache(res)
+        return res
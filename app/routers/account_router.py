@@ -5,14 +5,16 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
 from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..core.config import Settings
+from ..core.config import Settings, settings
 from ..core.database import get_session
+from ..core.media import largest_variant
 from ..core.security import decode_token
 from ..dependencies import AccessTokenBearer, CurrentUser, get_settings
 from ..repositories.user_repo import UserRepository
 from ..schemas.user_schema import UserSchema, UserUpdateSchema
 from ..services.user_service import UserService
-from ..utils.file import upload_image, upload_image_crop
+from ..utils.exceptions import ExecutorBusy
+from ..utils.file import upload_image
 
 router = APIRouter(
     dependencies=[Depends(AccessTokenBearer())]
@@ -47,9 +49,11 @@ async def upload_photo_profile(
     srv: UserService = Depends(get_service)
 ):
     try:
-        file_name = await upload_image_crop(file)
+        variants = await upload_image(file, settings.PHOTO_VARIANT_SIZES, crop=True)
 
         # update photo of user
-        return await srv.update_photo_profile(user, file_name)
+        return await srv.update_photo_profile(user, largest_variant(variants)["urls"]["jpeg"], variants)
+    except ExecutorBusy:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -6,7 +6,6 @@ from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..core.database import get_session
-from ..core.email import send_email_background
 from ..core.redis import add_jti_to_blocklist
 from ..dependencies import AccessTokenBearer, RefreshTokenBearer
 from ..repositories.user_repo import UserRepository
@@ -37,11 +36,13 @@ async def create_user_account(
     background_tasks: BackgroundTasks,
     userSrv: UserService = Depends(get_user_service)
 ):
-    new_user = await userSrv.create(user_data)
+    # the user and its verification email (when queued in the outbox) commit together
+    async with userSrv.repo.unit_of_work():
+        new_user = await userSrv.create(user_data)
 
-    if new_user:  # pragma: no cover
-        # Send link verification email
-        await MailService(background_tasks).send_verification_email(new_user)
+        if new_user:  # pragma: no cover
+            # Send link verification email
+            await MailService(background_tasks, userSrv.repo.session).send_verification_email(new_user)
 
     return JSONResponse(content={  # pragma: no cover
         "detail": "Account Created! Check email to verify your account",
@@ -88,7 +89,11 @@ async def revoke_token(token_details: dict = Depends(AccessTokenBearer())) -> JS
 
 
 @router.post("/email", responses={200: {"detail": "Email has been sent"}})
-async def simple_send_email(background_tasks: BackgroundTasks, email: EmailSchema) -> JSONResponse:
+async def simple_send_email(
+    background_tasks: BackgroundTasks,
+    email: EmailSchema,
+    session: AsyncSession = Depends(get_session),
+) -> JSONResponse:
     template_name = "common_email.html"
-    send_email_background(background_tasks, email, template_name)
+    await MailService(background_tasks, session).deliver(email, template_name)
     return JSONResponse(status_code=200, content={"detail": "Email has been sent"})
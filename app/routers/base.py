@@ -3,7 +3,7 @@ from fastapi import FastAPI
 from ..core.config import settings
 from ..internal import admin_router
 from . import (account_router, auth_router, hero_publisher_router, hero_router,
-               misc_router, web_router)
+               metrics_router, misc_router, web_router)
 
 
 def register_all_routers(app: FastAPI):
@@ -22,6 +22,10 @@ def register_all_routers(app: FastAPI):
     app.include_router(web_router.home_router)
     app.include_router(web_router.account_router, prefix=f"/account", tags=["web urls"])
 
+    # prometheus scrape endpoint
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router.router)
+
     # admin urls (internal)
     app.include_router(
         admin_router.router,
@@ -1,12 +1,15 @@
-from typing import Annotated, Optional
+from typing import Annotated, Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, FastAPI, Query, status
+from fastapi import APIRouter, Body, Depends, FastAPI, Query, status
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..core.database import get_session
+from ..core.database import get_read_session, get_session, get_stream_session
 from ..repositories.hero_publisher_repo import HeroPublisherRepository
+from ..schemas.bulk_schema import BulkDeleteResultSchema, BulkDeleteSchema, BulkResultSchema
 from ..schemas.hero_publisher_schema import HeroPublisherSchema, HeroPublisherCreateSchema, HeroPublisherUpdateSchema
 from ..services.hero_publisher_service import HeroPublisherService
+from ..utils.export import ExportFormat, export_response
 from ..utils.pagination import CustomPage
 
 router = APIRouter()
@@ -17,19 +20,59 @@ async def get_service(session: AsyncSession = Depends(get_session)) -> HeroPubli
     return HeroPublisherService(repo)
 
 
+async def get_read_service(session: AsyncSession = Depends(get_read_session)) -> HeroPublisherService:
+    repo = HeroPublisherRepository(session)
+    return HeroPublisherService(repo)
+
+
 @router.get("/", response_model=CustomPage[HeroPublisherSchema])
 async def read_hero_publishers(
     search: Optional[str] = Query(None, description="Search by name or secret_name", ),
     sorting: Optional[str] = Query(None, description="Sort by Model field e.g. id:desc or name:asc", ),
-    srv: HeroPublisherService = Depends(get_service)
+    srv: HeroPublisherService = Depends(get_read_service)
 ):
     return await srv.list(search=search, sorting=sorting)
 
 
+# export and bulk routes are declared before /{id} so they are never parsed as an id
+@router.get("/export", response_class=StreamingResponse)
+async def export_hero_publishers(
+    format: ExportFormat = Query("ndjson", description="ndjson or csv"),
+    search: Optional[str] = Query(None, description="Only export matching rows", ),
+    session: AsyncSession = Depends(get_stream_session)
+):
+    srv = HeroPublisherService(HeroPublisherRepository(session))
+    return export_response(srv.export(search=search), format, "hero_publishers", on_close=session.close)
+
+
+@router.post("/bulk", response_model=BulkResultSchema[HeroPublisherSchema])
+async def create_hero_publishers_bulk(
+    items: List[Dict[str, Any]] = Body(..., description="Objects to create, validated one by one"),
+    srv: HeroPublisherService = Depends(get_service)
+):
+    return await srv.bulk_create(items)
+
+
+@router.patch("/bulk", response_model=BulkResultSchema[HeroPublisherSchema])
+async def update_hero_publishers_bulk(
+    items: List[Dict[str, Any]] = Body(..., description="Partial objects to update, each with its `id`"),
+    srv: HeroPublisherService = Depends(get_service)
+):
+    return await srv.bulk_edit(items)
+
+
+@router.delete("/bulk", response_model=BulkDeleteResultSchema)
+async def delete_hero_publishers_bulk(
+    payload: BulkDeleteSchema,
+    srv: HeroPublisherService = Depends(get_service)
+):
+    return await srv.bulk_delete(payload.ids)
+
+
 @router.get("/{id}", response_model=HeroPublisherSchema)
 async def get_hero_publisher(
     id: int,
-    srv: HeroPublisherService = Depends(get_service)
+    srv: HeroPublisherService = Depends(get_read_service)
 ):
     return await srv.get_by_id(id)
 
@@ -1,13 +1,16 @@
-from typing import Annotated, Optional
+from typing import Annotated, Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, FastAPI, Query, status
+from fastapi import APIRouter, Body, Depends, FastAPI, Query, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Field, Session, SQLModel, create_engine, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..core.database import get_session
+from ..core.database import get_read_session, get_session, get_stream_session
 from ..repositories.hero_repo import HeroRepository
+from ..schemas.bulk_schema import BulkDeleteResultSchema, BulkDeleteSchema, BulkResultSchema
 from ..schemas.hero_schema import HeroSchema, HeroCreateSchema, HeroUpdateSchema
 from ..services.hero_service import HeroService
+from ..utils.export import ExportFormat, export_response
 from ..utils.pagination import CustomPage
 
 router = APIRouter()
@@ -18,19 +21,59 @@ async def get_service(session: AsyncSession = Depends(get_session)) -> HeroServi
     return HeroService(repo)
 
 
+async def get_read_service(session: AsyncSession = Depends(get_read_session)) -> HeroService:
+    repo = HeroRepository(session)
+    return HeroService(repo)
+
+
 @router.get("/", response_model=CustomPage[HeroSchema])
 async def read_heroes(
     search: Optional[str] = Query(None, description="Search by name or secret_name", ),
     sorting: Optional[str] = Query(None, description="Sort by Model field e.g. id:desc or name:asc", ),
-    srv: HeroService = Depends(get_service)
+    srv: HeroService = Depends(get_read_service)
 ):
     return await srv.list(search=search, sorting=sorting)
 
 
+# export and bulk routes are declared before /{id} so they are never parsed as an id
+@router.get("/export", response_class=StreamingResponse)
+async def export_heroes(
+    format: ExportFormat = Query("ndjson", description="ndjson or csv"),
+    search: Optional[str] = Query(None, description="Only export matching rows", ),
+    session: AsyncSession = Depends(get_stream_session)
+):
+    srv = HeroService(HeroRepository(session))
+    return export_response(srv.export(search=search), format, "heroes", on_close=session.close)
+
+
+@router.post("/bulk", response_model=BulkResultSchema[HeroSchema])
+async def create_heroes_bulk(
+    items: List[Dict[str, Any]] = Body(..., description="Objects to create, validated one by one"),
+    srv: HeroService = Depends(get_service)
+):
+    return await srv.bulk_create(items)
+
+
+@router.patch("/bulk", response_model=BulkResultSchema[HeroSchema])
+async def update_heroes_bulk(
+    items: List[Dict[str, Any]] = Body(..., description="Partial objects to update, each with its `id`"),
+    srv: HeroService = Depends(get_service)
+):
+    return await srv.bulk_edit(items)
+
+
+@router.delete("/bulk", response_model=BulkDeleteResultSchema)
+async def delete_heroes_bulk(
+    payload: BulkDeleteSchema,
+    srv: HeroService = Depends(get_service)
+):
+    return await srv.bulk_delete(payload.ids)
+
+
 @router.get("/{id}", response_model=HeroSchema)
 async def get_hero(
     id: int,
-    srv: HeroService = Depends(get_service)
+    srv: HeroService = Depends(get_read_service)
 ):
     return await srv.get_by_id(id)
 
@@ -0,0 +1,37 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..core.database import sessionmanager
+from ..core.metrics import CONTENT_TYPE, registry
+from ..core.security import password_hasher
+from ..utils.file import image_processor
+
+router = APIRouter()
+
+executors = [password_hasher, image_processor]
+
+
+def pool_gauge(key: str):
+    return lambda: {(engine,): stats[key] for engine, stats in sessionmanager.pool_stats().items()}
+
+
+def executor_gauge(key: str):
+    return lambda: {(executor.name,): executor.stats()[key] for executor in executors}
+
+
+# read from their owners when scraped, nothing to update on the request path
+registry.callback_gauge("db_pool_size", "Connections the pool keeps open.", ["engine"], pool_gauge("size"))
+registry.callback_gauge("db_pool_checked_out", "Connections in use.", ["engine"], pool_gauge("checked_out"))
+registry.callback_gauge("db_pool_checked_in", "Idle connections.", ["engine"], pool_gauge("checked_in"))
+registry.callback_gauge("db_pool_overflow", "Connections opened beyond the pool size.", ["engine"], pool_gauge("overflow"))
+registry.callback_gauge(
+    "executor_queue_depth", "Jobs waiting for a free worker.", ["executor"], executor_gauge("queue_depth")
+)
+registry.callback_gauge(
+    "executor_in_flight", "Jobs running or waiting.", ["executor"], executor_gauge("in_flight")
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
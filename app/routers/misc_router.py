@@ -7,7 +7,10 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..core.config import settings
 from ..core.database import get_session
+from ..core.media import largest_variant, variant_urls
+from ..core.storage import storage
 from ..dependencies import AccessTokenBearer, CurrentUser
+from ..utils.exceptions import ExecutorBusy
 from ..utils.file import upload_file, upload_image
 
 upload_router = APIRouter(
@@ -22,14 +25,17 @@ async def upload_image_file(
     session: AsyncSession = Depends(get_session),
 ):
     try:
-        file_name = await upload_image(file)
+        variants = variant_urls(await upload_image(file))
 
         return JSONResponse(
             content={
                 "detail": "Image upload Successfully",
-                "file_name": f"{settings.DOMAIN}/{file_name}",
+                "file_name": largest_variant(variants)["urls"]["jpeg"],
+                "variants": variants,
             }, status_code=status.HTTP_200_OK
         )
+    except ExecutorBusy:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -46,8 +52,10 @@ async def upload_files(
         return JSONResponse(
             content={
                 "detail": "File upload Successfully",
-                "file_name": f"{settings.DOMAIN}/{file_name}",
+                "file_name": storage.url(file_name),
             }, status_code=status.HTTP_200_OK
         )
+    except ExecutorBusy:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
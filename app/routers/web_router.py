@@ -105,7 +105,7 @@ async def resend_verification_link(
             msg = "Account already verified"
         else:
             # if user not verified, send verification email
-            await MailService(background_tasks).send_verification_email(user)  # pragma: no cover
+            await MailService(background_tasks, srv.repo.session).send_verification_email(user)  # pragma: no cover
     except Exception as e:
         print(str(e))
         msg = "Oops... Invalid Token"
@@ -0,0 +1,40 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+from sqlmodel import Field, SQLModel
+
+T = TypeVar('T')
+
+
+class BulkItemErrorSchema(SQLModel):
+    index: int  # position of the item in the request
+    id: Optional[int] = None
+    detail: str
+
+
+class BulkResultSchema(BaseModel, Generic[T]):
+    results: List[T] = []
+    errors: List[BulkItemErrorSchema] = []
+
+
+class BulkDeleteSchema(SQLModel):
+    ids: List[int] = Field(min_length=1)
+
+
+class BulkDeleteResultSchema(SQLModel):
+    deleted: List[int] = []
+    errors: List[BulkItemErrorSchema] = []
+
+
+class ImportRowErrorSchema(SQLModel):
+    row: int  # line number in the upload
+    detail: str
+
+
+class ImportReportSchema(SQLModel):
+    total: int = 0
+    imported: int = 0
+    rejected: int = 0
+    seconds: float = 0
+    rows_per_second: float = 0
+    errors: List[ImportRowErrorSchema] = []  # first IMPORT_MAX_ERRORS rejected rows
@@ -16,6 +16,10 @@ class HeroPublisherUpdateSchema(HeroPublisherCreateSchema):
     pass
 
 
+class HeroPublisherBulkUpdateSchema(HeroPublisherUpdateSchema):
+    id: int
+
+
 class HeroPublisherSchema(HeroPublisherCreateSchema, BaseModel):
     pass
 
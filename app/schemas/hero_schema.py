@@ -26,6 +26,10 @@ class HeroUpdateSchema(HeroCreateSchema):
     pass
 
 
+class HeroBulkUpdateSchema(HeroUpdateSchema):
+    id: int
+
+
 class HeroSchema(HeroCreateSchema, BaseModel):
     hero_publisher_id: Annotated[int, Field(exclude=True)]  # exlude/hide field from response schema
     hero_publisher: HeroPublisher | None = None
@@ -5,6 +5,8 @@ from pydantic import EmailStr, field_validator
 from sqlmodel import Field, Relationship, SQLModel
 
 from ..core.config import settings
+from ..core.media import variant_urls
+from ..core.storage import storage
 from ..utils.partial import optional
 from ..models.base import BaseModel
 from ..models.status import Status
@@ -31,10 +33,15 @@ class UserProfilePhotoUpdateSchema(SQLModel):
 
 class UserProfileSchema(UserProfileCreateSchema, BaseModel):
     photo: str | None = None
+    photo_variants: dict | None = None
     user_id: int | None = Field(exclude=True)
     status_id: int | None = Field(exclude=True)
     status: Status | None = None
 
     @field_validator('photo')
     def make_photo(cls, v: str):
-        return f"{settings.DOMAIN}/{v}" if v else None
+        return storage.url(v) if v else None
+
+    @field_validator('photo_variants')
+    def make_photo_variants(cls, v: dict):
+        return variant_urls(v) if v else None
@@ -120,7 +120,7 @@ class AuthService(BaseService):
         }
 
         # send email
-        await MailService(background_tasks).send__email(  # pragma: no cover
+        await MailService(background_tasks, self.repo.session).send__email(  # pragma: no cover
             email_payload=email_payload,
             template_name="request_reset_password_email.html"
         )
@@ -0,0 +1,101 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.config import settings
+from ..core.email import SMTPPool, build_message
+from ..logger import logging
+from ..repositories.email_outbox_repo import EmailOutboxRepository
+
+from .base import BaseService
+
+
+class EmailOutboxService(BaseService):
+    """Drains the email outbox: claim a batch, send it over pooled SMTP
+    sessions, then record each result in one transaction.
+
+    Failed emails are retried with exponential backoff (plus jitter) until
+    `max_attempts`, after which they are marked failed.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        sender: SMTPPool,
+        batch_size: int = settings.EMAIL_OUTBOX_BATCH_SIZE,
+        lease: float = settings.EMAIL_OUTBOX_LEASE,
+        max_attempts: int = settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        backoff_base: float = settings.EMAIL_OUTBOX_BACKOFF_BASE,
+        backoff_max: float = settings.EMAIL_OUTBOX_BACKOFF_MAX,
+    ):
+        self.session_factory = session_factory
+        self.sender = sender
+        self.batch_size = batch_size
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        # jitter spreads out retries of emails that failed together
+        return delay * random.uniform(0.5, 1.0)
+
+    async def run_once(self) -> int:
+        """Process one batch, returns how many emails were claimed."""
+        async with self.session_factory() as session:
+            repo = EmailOutboxRepository(session)
+
+            rows = await repo.claim(self.batch_size, self.lease)
+            if not rows:
+                return 0
+
+            errors: List[Optional[str]] = [None] * len(rows)
+            messages, sending = [], []
+            for i, row in enumerate(rows):
+                try:
+                    messages.append(build_message(row.subject, row.recipients, row.body, row.template_name))
+                    sending.append(i)
+                except Exception as e:
+                    errors[i] = f"render: {e}"
+
+            for i, error in zip(sending, await self.sender.send_batch(messages)):
+                if error is not None:
+                    errors[i] = f"{type(error).__name__}: {error}"
+
+            now = datetime.now()
+            async with repo.unit_of_work():
+                for row, error in zip(rows, errors):
+                    if error is None:
+                        row.status = "sent"
+                        row.sent_at = now
+                        row.last_error = None
+                        continue
+
+                    row.last_error = error[:1000]
+                    if row.attempts >= self.max_attempts:
+                        row.status = "failed"
+                        logging.error("email outbox: giving up on email %s: %s", row.id, error)
+                    else:
+                        row.next_attempt_at = now + timedelta(seconds=self.backoff(row.attempts))
+
+                await repo.add_all(rows)
+
+        return len(rows)
+
+    async def run(self, poll_interval: float = settings.EMAIL_OUTBOX_POLL_INTERVAL) -> None:
+        while True:
+            try:
+                claimed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error("email outbox batch failed: %s", e)
+                claimed = 0
+
+            # a full batch means there is a backlog, keep draining without waiting
+            if claimed < self.batch_size:
+                await asyncio.sleep(poll_interval)
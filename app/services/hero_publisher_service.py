@@ -1,8 +1,11 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+from ..core.config import settings
 from ..models import HeroPublisher
 from ..repositories.hero_publisher_repo import HeroPublisherRepository
-from ..schemas.hero_publisher_schema import HeroPublisherCreateSchema, HeroPublisherUpdateSchema
+from ..schemas.hero_publisher_schema import (HeroPublisherBulkUpdateSchema, HeroPublisherCreateSchema,
+                                             HeroPublisherSchema, HeroPublisherUpdateSchema)
+from ..utils.validation import checkBatchSize, validateItems
 
 from .base import BaseService
 
@@ -21,6 +24,11 @@ class HeroPublisherService(BaseService):
         """Retrieve all data from the repository."""
         return await self.repo.list(search=search, sorting=sorting)
 
+    async def export(self, search: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all data as JSON-ready dicts shaped like `HeroPublisherSchema`."""
+        async for obj in self.repo.export(search=search):
+            yield HeroPublisherSchema.model_validate(obj).model_dump(mode="json")
+
     async def get_by_id(self, id: int) -> HeroPublisher:
         """Retrieve a data by ID."""
         obj = await self.repo.get_by_id(id)
@@ -37,3 +45,21 @@ class HeroPublisherService(BaseService):
     async def delete(self, id: int) -> None:
         """Delete data to the repository."""
         return await self.repo.delete(id)
+
+    async def bulk_create(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add many data, reporting invalid items instead of failing the batch."""
+        valid, errors = validateItems(HeroPublisherCreateSchema, items, settings.BULK_MAX_ITEMS)
+        results, repo_errors = await self.repo.bulk_create(valid)
+        return {"results": results, "errors": sorted(errors + repo_errors, key=lambda e: e["index"])}
+
+    async def bulk_edit(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Edit many data, reporting invalid items instead of failing the batch."""
+        valid, errors = validateItems(HeroPublisherBulkUpdateSchema, items, settings.BULK_MAX_ITEMS)
+        results, repo_errors = await self.repo.bulk_edit(valid)
+        return {"results": results, "errors": sorted(errors + repo_errors, key=lambda e: e["index"])}
+
+    async def bulk_delete(self, ids: List[int]) -> Dict[str, Any]:
+        """Delete many data, reporting ids that don't exist."""
+        checkBatchSize(len(ids), settings.BULK_MAX_ITEMS)
+        deleted, errors = await self.repo.bulk_delete(ids)
+        return {"deleted": deleted, "errors": errors}
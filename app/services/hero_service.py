@@ -1,11 +1,15 @@
-from typing import List, Optional
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 
+from ..core.config import settings
 from ..models import Hero
 from ..repositories.hero_repo import HeroRepository
-from ..schemas.hero_schema import HeroCreateSchema, HeroUpdateSchema
+from ..schemas.hero_schema import HeroBulkUpdateSchema, HeroCreateSchema, HeroSchema, HeroUpdateSchema
 from ..utils.exceptions import ResponseException
+from ..utils.importer import ImportFormat, RecordError, iter_records
+from ..utils.validation import checkBatchSize, validateItems
 
 from .base import BaseService
 
@@ -24,6 +28,11 @@ class HeroService(BaseService):
         """Retrieve all data from the repository."""
         return await self.repo.list(search=search, sorting=sorting)
 
+    async def export(self, search: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all data as JSON-ready dicts shaped like `HeroSchema`."""
+        async for obj in self.repo.export(search=search):
+            yield HeroSchema.model_validate(obj).model_dump(mode="json")
+
     async def get_by_id(self, id: int) -> Hero:
         """Retrieve a data by ID."""
         obj = await self.repo.get_by_id(id)
@@ -40,3 +49,63 @@ class HeroService(BaseService):
     async def delete(self, id: int) -> None:
         """Delete data to the repository."""
         return await self.repo.delete(id)
+
+    async def bulk_create(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add many data, reporting invalid items instead of failing the batch."""
+        valid, errors = validateItems(HeroCreateSchema, items, settings.BULK_MAX_ITEMS)
+        results, repo_errors = await self.repo.bulk_create(valid)
+        return {"results": results, "errors": sorted(errors + repo_errors, key=lambda e: e["index"])}
+
+    async def bulk_edit(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Edit many data, reporting invalid items instead of failing the batch."""
+        valid, errors = validateItems(HeroBulkUpdateSchema, items, settings.BULK_MAX_ITEMS)
+        results, repo_errors = await self.repo.bulk_edit(valid)
+        return {"results": results, "errors": sorted(errors + repo_errors, key=lambda e: e["index"])}
+
+    async def bulk_delete(self, ids: List[int]) -> Dict[str, Any]:
+        """Delete many data, reporting ids that don't exist."""
+        checkBatchSize(len(ids), settings.BULK_MAX_ITEMS)
+        deleted, errors = await self.repo.bulk_delete(ids)
+        return {"deleted": deleted, "errors": errors}
+
+    async def import_stream(self, chunks: AsyncIterator[bytes], format: ImportFormat) -> Dict[str, Any]:
+        """Validate and load a streamed CSV / NDJSON upload, one transaction per batch.
+
+        Bad rows are rejected and reported by line number; the rest still load.
+        """
+        started = time.perf_counter()
+        report: Dict[str, Any] = {"total": 0, "imported": 0, "rejected": 0, "errors": []}
+
+        def reject(errors: List[Dict]) -> None:
+            report["rejected"] += len(errors)
+            room = settings.IMPORT_MAX_ERRORS - len(report["errors"])
+            report["errors"].extend(sorted(errors, key=lambda e: e["row"])[:max(room, 0)])
+
+        async def load(batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+            valid, errors = validateItems(HeroCreateSchema, [record for _, record in batch], len(batch))
+            imported, repo_errors = await self.repo.import_rows([(batch[index][0], obj) for index, obj in valid])
+
+            report["imported"] += imported
+            reject(
+                [{"row": batch[e["index"]][0], "detail": e["detail"]} for e in errors]
+                + [{"row": e["index"], "detail": e["detail"]} for e in repo_errors]
+            )
+
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+        async for row, record in iter_records(chunks, format):
+            report["total"] += 1
+            if isinstance(record, RecordError):
+                reject([{"row": row, "detail": str(record)}])
+                continue
+
+            batch.append((row, record))
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                await load(batch)
+                batch = []
+
+        if batch:
+            await load(batch)
+
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        report["rows_per_second"] = round(report["imported"] / report["seconds"], 1) if report["seconds"] else 0
+        return report
@@ -1,8 +1,13 @@
 from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+from fastapi import BackgroundTasks
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..core import security as securityFn, email as emailFn
 from ..core.config import settings
 from ..models import User
+from ..repositories.email_outbox_repo import EmailOutboxRepository
 from ..schemas.email_schema import EmailSchema
 
 from .base import EmailBackgroundTasksMixin
@@ -10,9 +15,23 @@ from .base import EmailBackgroundTasksMixin
 
 class MailService(EmailBackgroundTasksMixin):
 
+    def __init__(self, background_tasks: BackgroundTasks, session: Optional[AsyncSession] = None) -> None:
+        super().__init__(background_tasks)
+        self.session = session
+
+    async def deliver(self, email: EmailSchema, template_name: str) -> None:
+        if settings.EMAIL_BACKEND == "outbox":
+            if self.session is None:  # pragma: no cover
+                raise Exception("MailService needs a session to use the email outbox")
+
+            # stored with the caller's transaction, sent later by the email worker
+            await EmailOutboxRepository(self.session).enqueue(email, template_name)
+        else:
+            emailFn.send_email_background(self.background_tasks, email, template_name)
+
     async def send__email(self, email_payload: dict, template_name: str) -> None:
         email = EmailSchema(**email_payload)
-        emailFn.send_email_background(self.background_tasks, email, template_name)
+        await self.deliver(email, template_name)
 
     async def send_verification_email(self, new_user: User) -> None:
         expiration_datetime = datetime.now(UTC) + timedelta(seconds=3600)  # 60 minutes
@@ -37,4 +56,4 @@ class MailService(EmailBackgroundTasksMixin):
         }
         email = EmailSchema(**email_payload)
         template_name = "verification_email.html"
-        emailFn.send_email_background(self.background_tasks, email, template_name)
+        await self.deliver(email, template_name)
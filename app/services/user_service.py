@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from ..core.config import settings
 from ..models import User
@@ -22,6 +22,11 @@ class UserService(BaseService):
         """Retrieve all data from the repository."""
         return await self.repo.list(search=search, sorting=sorting)
 
+    async def export(self, search: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all data as JSON-ready dicts shaped like `UserSchema`."""
+        async for obj in self.repo.export(search=search):
+            yield UserSchema.model_validate(obj).model_dump(mode="json")
+
     async def get_by_id(self, id: int) -> User:
         """Retrieve a data by ID."""
         obj = await self.repo.get_by_id(id)
@@ -47,6 +52,9 @@ class UserService(BaseService):
     async def get_by_email(self, email: str) -> User:
         return await self.repo.get_by_email(email)
 
+    async def get_current_user(self, email: str) -> User:
+        return await self.repo.get_by_email_cached(email)
+
     async def verify_user(self, user: User) -> User:
         return await self.repo.verify_user(user)
 
@@ -59,8 +67,8 @@ class UserService(BaseService):
 
         return await self.repo.update_profile(user, payload)
 
-    async def update_photo_profile(self, user: User, file_path: str) -> User:
-        return await self.repo.update_photo_profile(user, file_path)
+    async def update_photo_profile(self, user: User, file_path: str, variants: Optional[dict] = None) -> User:
+        return await self.repo.update_photo_profile(user, file_path, variants)
 
     # TODO:
     # reset password
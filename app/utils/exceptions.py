@@ -92,6 +92,12 @@ class AccountSuspended(Exception):
     pass
 
 
+class ExecutorBusy(BaseException):
+    """A bounded worker pool has too many jobs waiting"""
+
+    pass
+
+
 def create_exception_handler(
     status_code: int, initial_detail: Any
 ) -> Callable[[Request, Exception], JSONResponse]:
@@ -226,6 +232,17 @@ def register_all_errors(app: FastAPI):
         ),
     )
 
+    app.add_exception_handler(
+        ExecutorBusy,
+        create_exception_handler(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            initial_detail={
+                "detail": "Server is busy, please try again shortly",
+                "resolution": "Retry the request after a few seconds"
+            },
+        ),
+    )
+
     @app.exception_handler(ResponseException)
     async def universal_exception_handler(_, exc: ResponseException):
         content = {
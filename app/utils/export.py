@@ -0,0 +1,89 @@
+# Defines helpers to stream query results as NDJSON or CSV.
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Literal, Optional
+
+from fastapi.responses import StreamingResponse
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# bytes buffered before a chunk is sent, one write per row would dominate the cost
+CHUNK_SIZE = 64 * 1024
+
+
+def flatten(row: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Nested dicts become dotted keys, e.g. `hero_publisher.name`."""
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+async def iter_ndjson(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    async for row in rows:
+        buffer.write(json.dumps(row, separators=(",", ":"), default=str))
+        buffer.write("\n")
+
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def iter_csv(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = None
+
+    async for row in rows:
+        row = flatten(row)
+        if writer is None:
+            # the header comes from the first row; rows of one export share a schema
+            writer = csv.DictWriter(buffer, fieldnames=list(row), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(row)
+
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+    rows: AsyncIterator[Dict[str, Any]],
+    format: ExportFormat,
+    filename: str,
+    on_close: Optional[Callable[[], Awaitable[Any]]] = None,
+) -> StreamingResponse:
+    """Stream `rows` in `format`; `on_close` runs once the body is finished or aborted."""
+    chunks = iter_csv(rows) if format == "csv" else iter_ndjson(rows)
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            if on_close is not None:
+                await on_close()
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
@@ -1,106 +1,243 @@
+import asyncio
+import contextlib
+import hashlib
 import io
+import json
+import math
 import os
 import shutil
+import tempfile
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
 
 import numpy as np  # type: ignore
 from fastapi import HTTPException, UploadFile
 from PIL import Image, UnidentifiedImageError  # type: ignore
 
+from ..core.config import settings
+from ..core.executor import BoundedExecutor
+# manifest url helpers, kept importable from here
+from ..core.media import largest_variant, variant_urls  # noqa: F401
+from ..core.storage import storage
+from .exceptions import ExecutorBusy
+
 # ALLOWED_MIME = {
 #     "image/jpeg": ".jpg",
 #     "image/png": ".png",
 #     "application/pdf": ".pdf"
 # }
 MAX_FILE_SIZE = 30 * 1024 * 1024  # 30 MB
+# uploads are copied to disk this much at a time, never read whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+# written last into a variant directory, its presence means the set is complete
+MANIFEST_NAME = "manifest.json"
+
+# Pillow format, file extension and encoder options of each variant format
+VARIANT_ENCODERS = {
+    "jpeg": ("JPEG", "jpg", {"quality": 85, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "avif": ("AVIF", "avif", {"quality": 60, "speed": 8}),
+}
 
 
-async def generate_file_path(file_name: str, file_type: str = "images") -> str:
-    root_dir = os.path.abspath(".")
+class FileTooLarge(Exception):
+    pass
 
+# decode / resize / encode run here so a large photo doesn't stall the event loop
+image_processor = BoundedExecutor(
+    "image-processor",
+    kind=settings.IMAGE_EXECUTOR,
+    max_workers=settings.IMAGE_WORKERS,
+    max_queue=settings.IMAGE_MAX_QUEUE,
+)
+
+
+def generate_file_path(file_name: str, file_type: str = "images") -> str:
+    """Storage key of a new upload, directories are created by the storage."""
     now = datetime.now()
     re_path = "{}/{}/{}/{}/{}/".format("static/media", file_type, now.year, now.month, now.day)
 
-    path = os.path.join(root_dir, re_path)
-    os.makedirs(path, exist_ok=True)
-
     return f"{re_path}{file_name}"
 
 
-async def save_resize_image(im, filename: str):
-    file_name, ext = os.path.splitext(filename)
-    # print(file_name)
-    # print(ext)
-    # print(im.size)
+@dataclass
+class SpooledUpload:
+    path: str  # temp file holding the upload, removed when the context exits
+    size: int
+    sha256: str
+
+
+@contextlib.asynccontextmanager
+async def spool_upload(file: UploadFile, max_size: int = MAX_FILE_SIZE) -> AsyncIterator[SpooledUpload]:
+    """Copy an upload to a temp file chunk by chunk, hashing it on the way.
+
+    Aborts as soon as `max_size` is exceeded, so memory per upload stays at
+    one chunk whatever the file size.
+    """
+    _, ext = os.path.splitext(file.filename or "")
+    fd, path = tempfile.mkstemp(suffix=ext, prefix="upload-", dir=await storage.staging_dir())
+
+    try:
+        digest = hashlib.sha256()
+        size = 0
+
+        with os.fdopen(fd, "wb") as tmp:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                # Validasi ukuran file
+                if size > max_size:
+                    raise FileTooLarge(f"File size exceeds {max_size // (1024 * 1024)}MB limit.")
+
+                digest.update(chunk)
+                await asyncio.to_thread(tmp.write, chunk)
+
+        yield SpooledUpload(path=path, size=size, sha256=digest.hexdigest())
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+
+# Workers: top-level functions so a process pool can pickle them. They read
+# the spooled file and write the result themselves, only paths cross over.
+def _open_image(path: str, min_size: tuple) -> Image.Image:
+    """Open as RGB, letting the JPEG decoder downscale to no less than `min_size`."""
+    im = Image.open(path)
+    # draft decodes at 1/2, 1/4 or 1/8 scale, far cheaper than a full decode + resize
+    im.draft("RGB", min_size)
+    return im.convert("RGB")
 
-    width, height = im.size
+
+def _resize_size(size: tuple) -> tuple:
+    width, height = size
 
     if width >= 1280:
-        size_defined = 1280, 720
+        return 1280, 720
     elif width >= 640:
-        size_defined = 640, 480
-    else:
-        size_defined = im.size
+        return 640, 480
+    return size
+
+
+def _resize_image(src: str, dest: str) -> None:
+    with Image.open(src) as probe:
+        size_defined = _resize_size(probe.size)
 
-    f_name = await generate_file_path(f"{str(uuid.uuid4())}{ext}")
+    im = _open_image(src, size_defined)
     im.thumbnail(size_defined)
     # im.save(f_name, 'JPEG', quality=70)
-    im.save(f_name, 'JPEG', optimize=True)
+    im.save(dest, 'JPEG', optimize=True)
+
+
+def _render_variants(src: str, dest_dir: str, sizes: Dict[str, int], formats: List[str], crop: bool = False) -> dict:
+    """Decode once and write every size in every format into `dest_dir`.
 
-    return f_name
+    Returns the manifest with file names relative to `dest_dir`.
+    """
+    with Image.open(src) as probe:
+        width, height = probe.size
 
+    # the largest variant bounds the decode, images are never upscaled
+    side = min(width, height) if crop else max(width, height)
+    scale = min(1.0, max(sizes.values()) / side)
+    im = _open_image(src, (math.ceil(width * scale), math.ceil(height * scale)))
 
-async def save_center_crop(image: Image.Image, size: int, filename: str) -> Image.Image:
+    if crop:
+        side = min(im.size)
+        left, top = (im.width - side) // 2, (im.height - side) // 2
+        im = im.crop((left, top, left + side, top + side))
+
+    variants = {}
+    # largest first, each smaller size is resampled from the previous one
+    for name, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+        im.thumbnail((size, size), Image.LANCZOS)
+
+        urls = {}
+        for fmt in formats:
+            pil_format, ext, options = VARIANT_ENCODERS[fmt]
+            im.save(os.path.join(dest_dir, f"{name}.{ext}"), pil_format, **options)
+            urls[fmt] = f"{name}.{ext}"
+
+        variants[name] = {"width": im.width, "height": im.height, "urls": urls}
+
+    return variants
+
+
+async def save_resize_image(src: str, filename: str):
     file_name, ext = os.path.splitext(filename)
 
-    # Resize gambar proporsional agar sisi terpendek >= target size
-    width, height = image.size
-    scale = size / min(width, height)
-    new_size = (int(width * scale), int(height * scale))
-    image = image.resize(new_size, Image.LANCZOS)
+    f_name = generate_file_path(f"{str(uuid.uuid4())}{ext}")
+    dest = os.path.join(await storage.staging_dir(), f"resized-{uuid.uuid4().hex}{ext}")
 
-    # Hitung crop box dari tengah
-    left = (image.width - size) // 2
-    top = (image.height - size) // 2
-    right = left + size
-    bottom = top + size
+    try:
+        await image_processor.run(_resize_image, src, dest)
+        return await storage.save_file(dest, f_name)
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            await asyncio.to_thread(os.remove, dest)
 
-    # Crop tengah
-    cropped_image = image.crop((left, top, right, bottom))
 
-    f_name = await generate_file_path(f"{str(uuid.uuid4())}{ext}")
-    cropped_image.save(f_name, 'JPEG', optimize=True)
+def available_formats(formats: List[str]) -> List[str]:
+    Image.init()
+    found = [fmt for fmt in formats if fmt in VARIANT_ENCODERS and VARIANT_ENCODERS[fmt][0] in Image.SAVE]
+    # every manifest carries a jpeg so any client has something to show
+    return found if "jpeg" in found else ["jpeg", *found]
 
-    return f_name
 
+VARIANT_FORMATS = available_formats(settings.IMAGE_VARIANT_FORMATS)
 
-async def upload_image_crop(
-    file: UploadFile
-) -> str:
+
+def variant_dir(sha256: str, sizes: Dict[str, int], crop: bool = False) -> str:
+    """Directory of one upload's variants, keyed by its content and the recipe."""
+    recipe = json.dumps([sha256, sorted(sizes.items()), VARIANT_FORMATS, crop])
+    key = hashlib.sha256(recipe.encode()).hexdigest()
+
+    return f"static/media/images/{key[:2]}/{key}"
+
+
+async def save_image_variants(upload: SpooledUpload, sizes: Dict[str, int], crop: bool = False) -> dict:
+    prefix = variant_dir(upload.sha256, sizes, crop)
+
+    # the same content was processed before, reuse its files
+    manifest = await storage.read(f"{prefix}/{MANIFEST_NAME}")
+    if manifest is not None:
+        return json.loads(manifest)
+
+    staging = await asyncio.to_thread(tempfile.mkdtemp, prefix="variants-", dir=await storage.staging_dir())
     try:
-        im = Image.open(io.BytesIO(await file.read())).convert("RGB")
+        rendered = await image_processor.run(_render_variants, upload.path, staging, sizes, VARIANT_FORMATS, crop)
 
-        f_name = await save_center_crop(im, 256, file.filename)
+        # publish the files concurrently, the manifest goes last and marks the set complete
+        await asyncio.gather(*(
+            storage.save_file(os.path.join(staging, file_name), f"{prefix}/{file_name}")
+            for variant in rendered.values()
+            for file_name in variant["urls"].values()
+        ))
 
-        return f_name
-    except Exception as e:
-        # raise Exception(str(e))
-        raise Exception("Please make sure the file is an image file")
+        variants = {
+            name: {**variant, "urls": {fmt: f"{prefix}/{file_name}" for fmt, file_name in variant["urls"].items()}}
+            for name, variant in rendered.items()
+        }
+        await storage.save_bytes(json.dumps(variants).encode(), f"{prefix}/{MANIFEST_NAME}", "application/json")
+    finally:
+        await asyncio.to_thread(shutil.rmtree, staging, ignore_errors=True)
+
+    return variants
 
 
 async def upload_image(
-    file: UploadFile
-) -> str:
+    file: UploadFile,
+    sizes: Optional[Dict[str, int]] = None,
+    crop: bool = False,
+) -> dict:
     try:
-        im = Image.open(io.BytesIO(await file.read())).convert("RGB")
-        # with Image.open(file.file) as im:
-        #     if im.mode in ("RGBA", "P", "L"):
-        #         im = im.convert("RGB")
-
-        f_name = await save_resize_image(im, file.filename)
+        async with spool_upload(file) as upload:
+            variants = await save_image_variants(upload, sizes or settings.IMAGE_VARIANT_SIZES, crop)
 
-        return f_name
+        return variants
+    except (ExecutorBusy, FileTooLarge):
+        raise
     except Exception as e:
         # raise Exception(str(e))
         raise Exception("Please make sure the file is an image file")
@@ -110,21 +247,16 @@ async def upload_file(
     file: UploadFile
 ) -> str:
     content_type = file.content_type
-    contents = await file.read()
     _, ext = os.path.splitext(file.filename)
 
-    # Validasi ukuran file
-    if len(contents) > MAX_FILE_SIZE:
-        raise Exception("File size exceeds 30MB limit.")
-
-    # Cek apakah file adalah image
-    if "image" in content_type:
-        im = Image.open(io.BytesIO(contents)).convert("RGB")
-        file_location = await save_resize_image(im, file.filename)
-    else:
-        file_location = await generate_file_path(f"{str(uuid.uuid4())}{ext}", "files")
-        # Kalau bukan image → simpan apa adanya
-        with open(file_location, "wb") as f:
-            f.write(contents)
+    async with spool_upload(file) as upload:
+        # Cek apakah file adalah image
+        if "image" in content_type:
+            file_location = await save_resize_image(upload.path, file.filename)
+        else:
+            # Kalau bukan image → simpan apa adanya
+            file_location = await storage.save_file(
+                upload.path, generate_file_path(f"{str(uuid.uuid4())}{ext}", "files"), content_type
+            )
 
     return file_location
@@ -0,0 +1,84 @@
+# Defines helpers to parse streamed CSV / NDJSON uploads into records.
+
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, Literal, Tuple, Union
+
+ImportFormat = Literal["ndjson", "csv"]
+
+
+class RecordError(ValueError):
+    """A line that could not be parsed into a record."""
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode byte chunks and split them into lines without newlines."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], RecordError]]]:
+    line_no = 0
+    async for line in iter_lines(chunks):
+        line_no += 1
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, RecordError(f"Invalid JSON: {e}")
+            continue
+
+        if not isinstance(record, dict):
+            yield line_no, RecordError("Expected a JSON object")
+            continue
+
+        yield line_no, record
+
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], RecordError]]]:
+    header = None
+    record, line_no, start = "", 0, 0
+
+    async for line in iter_lines(chunks):
+        line_no += 1
+        record = f"{record}\n{line}" if record else line
+        start = start or line_no
+
+        # an odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            continue
+
+        if record.strip():
+            values = next(csv.reader([record]))
+            if header is None:
+                header = [name.strip() for name in values]
+            elif len(values) != len(header):
+                yield start, RecordError(f"Expected {len(header)} columns, got {len(values)}")
+            else:
+                # empty cells are missing values, not empty strings
+                yield start, {name: value for name, value in zip(header, values) if value != ""}
+
+        record, start = "", 0
+
+    if record:
+        yield start, RecordError("Unterminated quoted field")
+
+
+def iter_records(
+    chunks: AsyncIterator[bytes], format: ImportFormat
+) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], RecordError]]]:
+    """`(line number, record or RecordError)` pairs of a streamed upload."""
+    return iter_csv(chunks) if format == "csv" else iter_ndjson(chunks)
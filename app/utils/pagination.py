@@ -1,19 +1,66 @@
 # global module e.g. pagination
 
-from typing import Optional, TypeVar
+import base64
+import json
+from typing import Any, Generic, Literal, MutableMapping, Optional, Sequence, TypeVar
 
-from fastapi import Query
+from fastapi import Query, status
+from fastapi.encoders import jsonable_encoder
 from fastapi_pagination.customization import (CustomizedPage,
                                               UseExcludedFields,
                                               UseFieldsAliases,
                                               UseIncludeTotal, UseName,
                                               UseParamsFields)
+from fastapi_pagination.default import Params
 from fastapi_pagination.links import Page
+from fastapi_pagination.links.bases import create_links, validation_decorator
+
+from .exceptions import ResponseException
 
 T = TypeVar('T')
 
+
+class CursorParams(Params):
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination: send an empty cursor for the first page, then `next_cursor`. "
+                    "Skips the total count and OFFSET scan.",
+    )
+    count: Optional[Literal["exact", "cached", "estimate"]] = Query(
+        None,
+        description="How `total` is computed: exact COUNT, cached for a short TTL, "
+                    "or the planner estimate (unfiltered lists on Postgres only).",
+    )
+
+    @property
+    def is_cursor(self) -> bool:
+        return self.cursor is not None
+
+
+class CursorPage(Page[T], Generic[T]):
+    next_cursor: Optional[str] = None
+    # which count strategy produced `total`, None when no total was computed
+    total_strategy: Optional[str] = None
+
+    __params_type__ = CursorParams
+
+    @validation_decorator
+    def __root_validator__(cls, value: Any) -> Any:
+        if isinstance(value, MutableMapping) and "links" not in value and value.get("total") is None:
+            # keyset pages have no total, link forward with the cursor instead
+            next_cursor = value.get("next_cursor")
+            value["links"] = create_links(
+                first={"cursor": ""},
+                last=None,
+                next={"cursor": next_cursor} if next_cursor else None,
+                prev=None,
+            )
+
+        return super().__root_validator__(value)
+
+
 CustomPage = CustomizedPage[
-    Page[T],
+    CursorPage[T],
     UseName("CustomPage"),
     UseParamsFields(
         size=Query(10, ge=1, le=100),
@@ -23,3 +70,29 @@ CustomPage = CustomizedPage[
         items="results",
     ),
 ]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(jsonable_encoder(list(values)), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def invalid_cursor() -> ResponseException:
+    return ResponseException(
+        detail="Cursor is invalid",
+        status_code=status.HTTP_400_BAD_REQUEST,
+        resolution="Use the next_cursor value returned by the previous page"
+    )
+
+
+def decode_cursor(cursor: str, length: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise invalid_cursor()
+
+    if not isinstance(values, list) or len(values) != length:
+        raise invalid_cursor()
+
+    return values
@@ -0,0 +1,48 @@
+# Defines search backends used by the repositories' `search` parameter.
+
+from typing import Any, Sequence
+
+from sqlalchemy import func, inspect
+from sqlmodel import col, or_
+from sqlmodel.sql.expression import SelectOfScalar
+
+
+class SearchBackend:
+    """Applies a free text search over some columns to a select statement."""
+
+    def apply(self, stmt: SelectOfScalar, columns: Sequence[Any], term: str) -> SelectOfScalar:
+        raise NotImplementedError("Please Override this method in child classes")  # pragma: no cover
+
+
+class LikeSearch(SearchBackend):
+    """Portable `ILIKE '%term%'`, a sequential scan without trigram indexes."""
+
+    def apply(self, stmt: SelectOfScalar, columns: Sequence[Any], term: str) -> SelectOfScalar:
+        return stmt.where(or_(*[col(column).icontains(term) for column in columns]))
+
+
+class TrigramSearch(SearchBackend):
+    """Postgres pg_trgm search.
+
+    `ILIKE '%term%'` is answered from the GIN `gin_trgm_ops` indexes added by
+    the trigram migration, and rows are ranked by their best similarity,
+    ties broken by primary key so pages stay stable. An explicit `sorting`
+    still takes precedence over the rank.
+    """
+
+    def apply(self, stmt: SelectOfScalar, columns: Sequence[Any], term: str) -> SelectOfScalar:
+        stmt = stmt.where(or_(*[col(column).ilike(f"%{term}%") for column in columns]))
+
+        similarities = [func.similarity(column, term) for column in columns]
+        rank = similarities[0] if len(similarities) == 1 else func.greatest(*similarities)
+
+        # rows with equal rank would otherwise come back in any order per page
+        entity = stmt.column_descriptions[0]["entity"]
+        return stmt.order_by(rank.desc(), *inspect(entity).primary_key)
+
+
+def get_search_backend(dialect_name: str, backend: str = "auto") -> SearchBackend:
+    if backend == "trigram" or (backend == "auto" and dialect_name == "postgresql"):
+        return TrigramSearch()
+
+    return LikeSearch()
@@ -0,0 +1,116 @@
+# Defines static file serving with cache headers and precompressed assets.
+
+import os
+import re
+import stat
+from mimetypes import guess_type
+from typing import Optional, Set
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+from ..core.config import settings
+
+# a sha256 directory (see file.variant_dir): its files never change once written
+CONTENT_HASH_RE = re.compile(r"(?:^|/)(?P<hash>[0-9a-f]{64})/(?P<name>[^/]+)$")
+
+# assets that may ship with .br / .gz siblings, best encoding first
+PRECOMPRESSED_EXTENSIONS = {".css", ".js", ".mjs", ".svg", ".json", ".map", ".txt", ".html"}
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(header: str) -> Set[str]:
+    encodings = set()
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        # "br;q=0" explicitly refuses br
+        if name.strip() and quality > 0:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles for uploaded media and assets, friendly to CDNs and browsers.
+
+    Content-addressed files get a strong ETag derived from their path and an
+    immutable Cache-Control; everything else is cached for `max_age` and
+    revalidated. CSS/JS are served from a `.br` / `.gz` sibling when the
+    client accepts it. Range requests are handled by FileResponse; sendfile
+    is left to the server or the proxy in front of it.
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_age: int = settings.STATIC_MAX_AGE,
+        immutable_max_age: int = settings.STATIC_IMMUTABLE_MAX_AGE,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+        self.immutable_max_age = immutable_max_age
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] in ("GET", "HEAD") and os.path.splitext(path)[1] in PRECOMPRESSED_EXTENSIONS:
+            accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+
+            for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+                if encoding not in accepted:
+                    continue
+
+                full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+                if stat_result and stat.S_ISREG(stat_result.st_mode):
+                    return self.file_response(full_path, stat_result, scope, content_encoding=encoding, path=path)
+
+        return await super().get_response(path, scope)
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+        content_encoding: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        # the requested path, which differs from full_path for a precompressed sibling
+        path = path or self.get_path(scope)
+
+        headers = {}
+        media_type = None
+
+        match = CONTENT_HASH_RE.search(path.replace(os.sep, "/"))
+        if match:
+            headers["cache-control"] = f"public, max-age={self.immutable_max_age}, immutable"
+            # the bytes are fixed by the hash and name, no need to stat or read them
+            headers["etag"] = f'"{match["hash"]}-{match["name"]}{"-" + content_encoding if content_encoding else ""}"'
+        else:
+            headers["cache-control"] = f"public, max-age={self.max_age}"
+
+        if os.path.splitext(path)[1] in PRECOMPRESSED_EXTENSIONS:
+            headers["vary"] = "Accept-Encoding"
+
+        if content_encoding:
+            headers["content-encoding"] = content_encoding
+            # type of the asset, not of the .br / .gz file
+            media_type = guess_type(path)[0]
+
+        response = FileResponse(
+            full_path, status_code=status_code, headers=headers, media_type=media_type, stat_result=stat_result
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
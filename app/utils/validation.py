@@ -1,28 +1,60 @@
 # Defines functions for validation.
 
 from fastapi import status
+from pydantic import ValidationError
 
 from ..utils.exceptions import ResponseException
 
 
-def formatSorting(model, sorting):
+def parseSorting(model, sorting):
+    """Split `field:asc|desc` into the field name and a descending flag."""
     try:
         x = sorting.split(":")
 
         if not hasattr(model, x[0]):
             raise Exception()
 
-        # print(x[0])
-        # print(x[1])
-        if (x[1].lower() == 'desc'):
-            xSort = f"{x[0]} desc"
-        else:
-            xSort = f"{x[0]} asc"
-
-        return xSort
+        return x[0], x[1].lower() == 'desc'
     except Exception as e:
         raise ResponseException(
             detail="Sorting formatted incorrectly",
             status_code=status.HTTP_400_BAD_REQUEST,
             resolution="Try e.g. field_name:ASC or field_name:desc"
         )
+
+
+def formatSorting(model, sorting):
+    field, desc = parseSorting(model, sorting)
+
+    return f"{field} desc" if desc else f"{field} asc"
+
+
+def checkBatchSize(count, max_items):
+    if count > max_items:
+        raise ResponseException(
+            detail=f"Too many items, at most {max_items} per request",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            resolution="Split the payload into smaller batches"
+        )
+
+
+def validateItems(schema, items, max_items):
+    """Validate each item of a bulk payload on its own.
+
+    Returns `(valid, errors)`: `(index, obj)` pairs and per-item error dicts,
+    so one bad item doesn't reject the whole batch.
+    """
+    checkBatchSize(len(items), max_items)
+
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "id": item.get("id") if isinstance(item.get("id"), int) else None,
+                "detail": "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()),
+            })
+
+    return valid, errors
@@ -0,0 +1,137 @@
+"""Access log middleware overhead benchmark.
+
+Sends requests straight into the ASGI app (no server, no client) with no
+access log middleware, the previous `@app.middleware("http")` timer, and
+`AccessLogMiddleware`, for a small JSON response and a streamed one.
+
+    python -m benchmarks.bench_access_log [--number N]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from app.logger import access_logger
+from app.middleware import AccessLogMiddleware
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(32):
+                yield b"x" * 1024
+
+        return StreamingResponse(chunks())
+
+    return app
+
+
+def with_http_middleware(app: FastAPI) -> FastAPI:
+    # the timer AccessLogMiddleware replaced
+    @app.middleware("http")
+    async def custom_logging(request: Request, call_next):
+        start = time.time()
+
+        response = await call_next(request)
+
+        process_time = time.time() - start
+        client = request.client or ("-", 0)
+        access_logger.info(
+            '%s:%s - "%s %s" %s - completed after %s',
+            client[0], client[1], request.method, request.url.path, response.status_code, process_time,
+            extra={
+                'url': request.url.path,
+                'method': request.method,
+                'status_code': response.status_code,
+                'process_time': process_time,
+            },
+        )
+
+        return response
+
+    return app
+
+
+def with_asgi_middleware(app: FastAPI) -> FastAPI:
+    app.add_middleware(AccessLogMiddleware)
+    return app
+
+
+async def request(app, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("test", 80),
+    }
+
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # like a server: nothing more until the client disconnects
+        await asyncio.Event().wait()
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, path: str, number: int) -> float:
+    # warm up: builds the middleware stack and the route's caches
+    for _ in range(100):
+        await request(app, path)
+
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        await request(app, path)
+    return (time.perf_counter_ns() - start) / number
+
+
+def main(number: int) -> None:
+    # measure the middleware, not the log handlers
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    access_logger.addHandler(logging.NullHandler())
+
+    apps = [
+        ("no access log", create_app()),
+        ('@app.middleware("http")', with_http_middleware(create_app())),
+        ("AccessLogMiddleware", with_asgi_middleware(create_app())),
+    ]
+
+    for path in ("/items/42", "/stream"):
+        print(f"GET {path}, {number} requests\n")
+        baseline = None
+        for label, app in apps:
+            ns = asyncio.run(measure(app, path, number))
+            baseline = baseline or ns
+            print(f"{label:<28} {ns / 1e3:>8.1f} us/request {(ns - baseline) / 1e3:>+8.1f} us overhead")
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=10_000)
+    main(parser.parse_args().number)
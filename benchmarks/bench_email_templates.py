@@ -0,0 +1,62 @@
+"""Email template rendering benchmark.
+
+Compares the per-message environment fastapi-mail builds with a shared
+environment and with `EmailTemplates` (partials inlined, bytecode cache).
+
+    python -m benchmarks.bench_email_templates [--number N]
+"""
+
+import argparse
+import tempfile
+import timeit
+
+from jinja2 import Environment, FileSystemLoader
+
+from app.core.templating import EmailTemplates
+
+TEMPLATE = "verification_email.html"
+CONTEXT = {
+    "name": "John Doe",
+    "action_url": "http://localhost:8000/account/verify/token",
+    "action_resend_url": "http://localhost:8000/account/resend-verification/token",
+}
+
+
+def per_message_environment() -> str:
+    # what fastapi-mail does for every send_message(template_name=...)
+    env = Environment(loader=FileSystemLoader("templates"))
+    return env.get_template(TEMPLATE).render(**CONTEXT)
+
+
+def report(label: str, seconds: float, number: int) -> None:
+    print(f"{label:<40} {seconds / number * 1e6:>10.1f} us/op {number / seconds:>12.0f} ops/s")
+
+
+def main(number: int) -> None:
+    shared = Environment(loader=FileSystemLoader("templates"))
+    shared.get_template(TEMPLATE)
+
+    templates = EmailTemplates("templates")
+    templates.compile_all()
+
+    print(f"render {TEMPLATE}, {number} times\n")
+    report("fastapi-mail (environment per message)", timeit.timeit(per_message_environment, number=number), number)
+    report("shared environment", timeit.timeit(lambda: shared.get_template(TEMPLATE).render(**CONTEXT), number=number), number)
+    report("EmailTemplates", timeit.timeit(lambda: templates.render(TEMPLATE, CONTEXT), number=number), number)
+
+    # startup: compile everything from source vs load it from the bytecode cache
+    with tempfile.TemporaryDirectory() as cache_dir:
+        EmailTemplates("templates", cache_dir=cache_dir).compile_all()
+
+        runs = 20
+        print()
+        report("compile_all, no cache", timeit.timeit(lambda: EmailTemplates("templates").compile_all(), number=runs), runs)
+        report("compile_all, bytecode cache", timeit.timeit(
+            lambda: EmailTemplates("templates", cache_dir=cache_dir).compile_all(), number=runs
+        ), runs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="renders per variant")
+    main(parser.parse_args().number)
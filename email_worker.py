@@ -0,0 +1,33 @@
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.core.database import sessionmanager
+from app.core.email import SMTPPool
+from app.logger import logging
+from app.services.email_outbox_service import EmailOutboxService
+
+
+async def run_email_worker(once: bool = False):
+    sender = SMTPPool(settings.EMAIL_SMTP_POOL_SIZE)
+    service = EmailOutboxService(sessionmanager.new_session, sender)
+
+    try:
+        if once:
+            # drain everything that is due, then exit
+            while await service.run_once():
+                pass
+        else:
+            logging.info("email worker started")
+            await service.run()
+    finally:
+        await sender.close()
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send emails queued in the email outbox")
+    parser.add_argument("--once", action="store_true", help="send what is due and exit")
+    args = parser.parse_args()
+
+    asyncio.run(run_email_worker(args.once))
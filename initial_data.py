@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import json
 import os
@@ -13,9 +14,11 @@ from sqlmodel.sql.expression import SelectOfScalar
 from app.core.config import settings
 from app.core.database import sessionmanager
 from app.core.security import generate_passwd_hash, verify_password
-from app.models import (Hero, HeroCreate, HeroPublisher, Status, User,
-                        UserProfile)
+from app.models import Hero, HeroPublisher, Status, User, UserProfile
 from app.repositories.base import BaseRepository
+from app.repositories.hero_repo import HeroRepository
+from app.schemas.hero_schema import HeroCreateSchema
+from app.services.hero_service import HeroService
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 # Get current directory
@@ -87,7 +90,7 @@ async def populate_hero_data():
                 if i["publisher"] in u.name:
                     publisher_id = u.id
 
-            model = HeroCreate(
+            model = HeroCreateSchema(
                 name=i["alter_ego"],
                 age=randint(20, 40),
                 secret_name=i["superhero"],
@@ -143,7 +146,33 @@ async def populate_admin_super_user():
 
     print("------ END POPULATE_ADMIN_SUPER_USER ------")
 
+
+async def import_hero_file(path: str, format: str | None = None):
+    print("------ START IMPORT_HERO_FILE ------")
+    format = format or ("csv" if path.endswith(".csv") else "ndjson")
+
+    async def read_chunks():
+        # 1 MiB at a time, the file is never loaded whole
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                yield chunk
+
+    async with sessionmanager.session() as db_session:
+        report = await HeroService(HeroRepository(db_session)).import_stream(read_chunks(), format)
+
+    print(json.dumps(report, indent=2))
+    print("------ END IMPORT_HERO_FILE ------")
+
+
 if __name__ == "__main__":
-    asyncio.run(populate_hero_data())
-    asyncio.run(populate_status_data())
-    asyncio.run(populate_admin_super_user())
+    parser = argparse.ArgumentParser(description="Populate initial data")
+    parser.add_argument("--import-heroes", metavar="PATH", help="load heroes from a CSV or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="file format, guessed from the extension")
+    args = parser.parse_args()
+
+    if args.import_heroes:
+        asyncio.run(import_hero_file(args.import_heroes, args.format))
+    else:
+        asyncio.run(populate_hero_data())
+        asyncio.run(populate_status_data())
+        asyncio.run(populate_admin_super_user())
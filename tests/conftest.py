@@ -6,7 +6,7 @@ from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.core.database import DatabaseSessionManager, get_session
+from app.core.database import DatabaseSessionManager, get_session, get_stream_session
 from app.main import app
 
 BASE_URL = 'http://test'
@@ -50,7 +50,7 @@ async def db_session(sessionmanager):
 
 
 @pytest.fixture(scope="function")
-async def client(db_session):
+async def client(db_session, sessionmanager):
     """Create a test client that uses the override_get_db fixture to return a session."""
 
     async def ovveride_get_session() -> AsyncSession:  # type: ignore
@@ -62,6 +62,8 @@ async def client(db_session):
 
     # ovveride Session
     app.dependency_overrides[get_session] = ovveride_get_session
+    # streaming responses own a separate session on the test database
+    app.dependency_overrides[get_stream_session] = lambda: sessionmanager.new_session()
 
     async with AsyncClient(transport=ASGITransport(app=app), base_url=BASE_URL) as client:
         yield client
@@ -0,0 +1,60 @@
+import uuid
+
+from app.core.redis import (BlocklistFilter, add_jti_to_blocklist,
+                            redismanager, token_in_blocklist)
+from app.utils.bloom import BloomFilter
+
+from . import pytest, pytestmark
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [str(uuid.uuid4()) for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    # never a false negative
+    assert all(item in bloom for item in items)
+    assert bloom.is_full
+
+    # false positives stay around the configured rate
+    false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(2000))
+    assert false_positives < 100
+
+
+async def test_blocklist_filter_sync():
+    jti = str(uuid.uuid4())
+    await add_jti_to_blocklist(jti)
+    assert await token_in_blocklist(jti)
+
+    local = BlocklistFilter(capacity=1000, error_rate=0.001, ttl=60, max_staleness=10)
+    assert not local.ready
+
+    await local.sync(redismanager.client)
+
+    assert local.ready
+    assert local.might_contain(jti)
+    assert not local.might_contain(str(uuid.uuid4()))
+
+
+
+async def test_blocklist_filter_repeated_sync_does_not_fill():
+    local = BlocklistFilter(capacity=1000, error_rate=0.001, ttl=60, max_staleness=10)
+    await add_jti_to_blocklist(str(uuid.uuid4()))
+
+    await local.sync(redismanager.client)
+    count = len(local._bloom)
+    assert count >= 1
+
+    # an idle system re-reads the same overlap window on every sync
+    for _ in range(5):
+        assert await local.sync(redismanager.client) == 0
+
+    assert len(local._bloom) == count
+
+    # nor does a jti added locally and then read back from the index
+    jti = str(uuid.uuid4())
+    await add_jti_to_blocklist(jti)
+    local.add(jti)
+    assert await local.sync(redismanager.client) == 0
+    assert len(local._bloom) == count + 1
@@ -0,0 +1,51 @@
+import asyncio
+import os
+import threading
+
+from app.core.executor import BoundedExecutor, process_context
+from app.core.security import generate_passwd_hash, password_hasher, verify_password
+from app.utils.exceptions import ExecutorBusy
+
+from . import pytest, pytestmark
+
+
+async def test_password_hash_runs_in_pool():
+    hashed = await generate_passwd_hash("testpass123")
+
+    assert await verify_password("testpass123", hashed)
+    assert not await verify_password("wrong password", hashed)
+    assert password_hasher.stats()["completed"] >= 3
+
+
+async def test_bounded_executor_rejects_when_queue_full():
+    release = threading.Event()
+    pool = BoundedExecutor("test", max_workers=1, max_queue=1)
+
+    # one job running, one waiting
+    running = asyncio.ensure_future(pool.run(release.wait))
+    waiting = asyncio.ensure_future(pool.run(release.wait))
+    await asyncio.sleep(0)
+
+    assert pool.queue_depth == 1
+    with pytest.raises(ExecutorBusy):
+        await pool.run(release.wait)
+
+    release.set()
+    await asyncio.gather(running, waiting)
+
+    stats = pool.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["in_flight"] == 0
+
+    pool.shutdown()
+
+
+async def test_process_pool_does_not_fork_the_app():
+    # this process already runs threads, which a forked worker would inherit locks from
+    assert process_context().get_start_method() in ("forkserver", "spawn")
+
+    pool = BoundedExecutor("test-process", kind="process", max_workers=1)
+    assert await pool.run(os.getpid) != os.getpid()
+
+    pool.shutdown()
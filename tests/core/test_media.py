@@ -0,0 +1,19 @@
+from app.core.media import largest_variant, variant_urls
+from app.core.storage import storage
+
+from . import pytest, pytestmark
+
+
+def test_variant_urls():
+    variants = {
+        "thumbnail": {"width": 160, "height": 120, "urls": {"jpeg": "static/media/images/ab/abc/thumbnail.jpg"}},
+        "large": {"width": 1280, "height": 960, "urls": {"jpeg": "static/media/images/ab/abc/large.jpg"}},
+    }
+
+    urls = variant_urls(variants)
+
+    assert urls["large"]["urls"]["jpeg"] == storage.url("static/media/images/ab/abc/large.jpg")
+    assert urls["large"]["width"] == 1280
+    # the stored manifest keeps its keys
+    assert variants["large"]["urls"]["jpeg"] == "static/media/images/ab/abc/large.jpg"
+    assert largest_variant(urls) is urls["large"]
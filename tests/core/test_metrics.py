@@ -0,0 +1,48 @@
+from app.core.metrics import Registry
+
+from . import pytest, pytestmark
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency.", ["route"], buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "/items/{item_id}")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{route="/items/{item_id}",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/items/{item_id}",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/items/{item_id}",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/items/{item_id}"} 4' in lines
+    assert 'latency_seconds_sum{route="/items/{item_id}"} 3.65' in lines
+    assert latency.count("/items/{item_id}") == 4
+
+
+def test_counter_gauge_and_callback_gauge():
+    registry = Registry()
+    requests = registry.counter("requests", "Requests.", ["status"])
+    in_flight = registry.gauge("in_flight", "In flight.")
+    registry.callback_gauge("queue_depth", "Queue depth.", ["executor"], lambda: {("hasher",): 3})
+
+    requests.inc("200")
+    requests.inc("200")
+    requests.inc('bad"label')
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    lines = registry.render().splitlines()
+    # 0.0.4 only attaches HELP / TYPE to samples of the same name
+    assert "# HELP requests_total Requests." in lines
+    assert "# TYPE requests_total counter" in lines
+    assert "# TYPE in_flight gauge" in lines
+    assert "# TYPE queue_depth gauge" in lines
+    assert 'requests_total{status="200"} 2' in lines
+    assert 'requests_total{status="bad\\"label"} 1' in lines
+    assert "in_flight 1" in lines
+    assert 'queue_depth{executor="hasher"} 3' in lines
+
+    with pytest.raises(ValueError):
+        registry.counter("requests", "Again.")
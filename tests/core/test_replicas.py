@@ -0,0 +1,53 @@
+from app.core.database import DatabaseSessionManager, get_read_session, sessionmanager
+
+from . import pytest, pytestmark
+
+PRIMARY_URL = "sqlite+aiosqlite:///testdb.sqlite3"
+REPLICA_URLS = ["sqlite+aiosqlite:///testdb_replica1.sqlite3", "sqlite+aiosqlite:///testdb_replica2.sqlite3"]
+
+
+@pytest.fixture
+async def manager():
+    manager = DatabaseSessionManager(PRIMARY_URL, {"echo": False}, replica_hosts=REPLICA_URLS)
+    yield manager
+    await manager.close()
+
+
+async def test_read_session_round_robin(manager):
+    engines = []
+    for _ in range(4):
+        async with manager.read_session() as session:
+            engines.append(session.bind)
+
+    replica_engines = [replica.engine for replica in manager._replicas]
+    assert engines == replica_engines * 2
+
+
+async def test_read_session_falls_back_to_primary(manager):
+    manager._replicas[0].lag = 60.0
+    manager._replicas[0].healthy = False
+    manager._replicas[1].healthy = False
+
+    async with manager.read_session() as session:
+        assert session.bind is manager._engine
+
+
+async def test_check_replicas_marks_unreachable_unhealthy():
+    manager = DatabaseSessionManager(
+        PRIMARY_URL, {"echo": False}, replica_hosts=["sqlite+aiosqlite:///missing_dir/replica.sqlite3"]
+    )
+
+    await manager.check_replicas()
+
+    assert not manager._replicas[0].healthy
+    assert manager.pick_replica() is None
+    await manager.close()
+
+
+async def test_get_read_session_without_replicas_reuses_session():
+    assert not sessionmanager.has_replicas
+
+    primary = object()
+    dependency = get_read_session(primary)
+
+    assert await dependency.__anext__() is primary
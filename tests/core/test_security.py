@@ -0,0 +1,31 @@
+import hashlib
+from datetime import timedelta
+
+from app.core.security import create_access_token, decode_token, verified_tokens
+
+from . import pytest, pytestmark
+
+
+async def test_decode_token_cached():
+    token = await create_access_token(user_data={"email": "user@example.com", "user_id": "1"})
+    key = hashlib.sha256(token.encode()).digest()
+
+    first = await decode_token(token)
+    assert key in verified_tokens
+
+    second = await decode_token(token)
+    assert second == first
+
+    # callers get their own copy
+    second["refresh"] = True
+    assert (await decode_token(token))["refresh"] is False
+
+
+async def test_decode_token_expired_not_cached():
+    token = await create_access_token(
+        user_data={"email": "user@example.com", "user_id": "1"},
+        expiry=timedelta(seconds=-1),
+    )
+
+    assert await decode_token(token) is None
+    assert hashlib.sha256(token.encode()).digest() not in verified_tokens
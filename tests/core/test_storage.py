@@ -0,0 +1,69 @@
+import os
+
+from app.core.storage import LocalStorage, S3Storage
+
+from . import pytest, pytestmark
+
+
+async def test_local_storage_roundtrip(tmp_path):
+    storage = LocalStorage(str(tmp_path), "http://testserver/")
+
+    src = os.path.join(await storage.staging_dir(), "upload.bin")
+    with open(src, "wb") as f:
+        f.write(b"payload")
+
+    key = await storage.save_file(src, "static/media/files/a/upload.bin")
+
+    # moved, not copied
+    assert not os.path.exists(src)
+    assert await storage.read(key) == b"payload"
+    assert await storage.exists(key)
+    assert storage.url(key) == "http://testserver/static/media/files/a/upload.bin"
+
+    await storage.save_bytes(b"{}", "static/media/files/a/manifest.json")
+    assert await storage.read("static/media/files/a/manifest.json") == b"{}"
+
+    await storage.delete(key)
+    assert await storage.read(key) is None
+    assert not await storage.exists(key)
+
+
+@pytest.fixture
+def s3_endpoint():
+    # moto's server is a local stand-in for any S3 compatible service
+    moto_server = pytest.importorskip("moto.server")
+    server = moto_server.ThreadedMotoServer(port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+async def test_s3_storage_multipart_roundtrip(tmp_path, s3_endpoint):
+    storage = S3Storage(
+        "media",
+        endpoint_url=s3_endpoint,
+        region="us-east-1",
+        access_key_id="test",
+        secret_access_key="test",
+        multipart_threshold=5 * 1024 * 1024,
+        multipart_chunksize=5 * 1024 * 1024,
+        max_concurrency=4,
+    )
+    storage.client.create_bucket(Bucket="media")
+
+    # above the threshold: uploaded as parallel parts
+    data = os.urandom(12 * 1024 * 1024)
+    src = tmp_path / "large.bin"
+    src.write_bytes(data)
+
+    key = await storage.save_file(str(src), "static/media/files/large.bin")
+
+    assert not src.exists()
+    assert await storage.read(key) == data
+    assert await storage.exists(key)
+    assert storage.url(key) == f"{s3_endpoint}/media/static/media/files/large.bin"
+
+    await storage.delete(key)
+    assert await storage.read(key) is None
+    assert not await storage.exists(key)
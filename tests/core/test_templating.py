@@ -0,0 +1,52 @@
+import os
+
+from jinja2 import Environment, FileSystemLoader
+
+from app.core.templating import EmailTemplates
+
+from . import pytest, pytestmark
+
+CONTEXT = {
+    "name": "John Doe",
+    "title": "Hello",
+    "action_url": "http://test/verify/abc?x=1&y=2",
+    "action_resend_url": "http://test/resend/abc",
+}
+
+
+@pytest.mark.parametrize("template_name", [
+    "common_email.html",
+    "verification_email.html",
+    "request_reset_password_email.html",
+])
+def test_render_matches_plain_environment(tmp_path, template_name):
+    templates = EmailTemplates("templates", cache_dir=str(tmp_path))
+    # what fastapi-mail renders, one fresh environment per message
+    expected = Environment(loader=FileSystemLoader("templates")).get_template(template_name).render(**CONTEXT)
+
+    assert templates.render(template_name, CONTEXT) == expected
+
+
+def test_partials_are_inlined():
+    templates = EmailTemplates("templates")
+    source, _, uptodate = templates.env.loader.get_source(templates.env, "partials/base_email.html")
+
+    assert "include" not in source
+    assert "email-masthead_name" in source
+    assert uptodate()
+
+
+def test_bytecode_cache_is_reused(tmp_path):
+    names = EmailTemplates("templates", cache_dir=str(tmp_path)).compile_all()
+
+    assert "verification_email.html" in names
+    assert len(os.listdir(tmp_path)) >= len(names)
+
+    # a new process loads the cached code instead of compiling
+    templates = EmailTemplates("templates", cache_dir=str(tmp_path))
+    compiled = []
+    original = templates.env.compile
+    templates.env.compile = lambda *args, **kwargs: compiled.append(args) or original(*args, **kwargs)
+
+    templates.render("verification_email.html", CONTEXT)
+    assert compiled == []
@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from fastapi import status
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models import Hero, HeroPublisher
+from app.repositories.user_repo import UserRepository
+from app.schemas.auth_schema import LoginSchema
+from app.schemas.user_schema import UserCreateSchema
+from app.services.auth_service import AuthService
+
+from . import pytest, pytestmark
+
+
+class TestInternalImportHeroes:
+    @pytest.fixture(autouse=True)
+    def init(self, client, api_prefix, db_session, payload_user_register, payload_user_login):
+        self.client = client
+        self.db_session = db_session
+        self.payload_user_register = payload_user_register
+        self.payload_user_login = payload_user_login
+        self.url = f"admin{api_prefix}/heroes/import"
+        self.repo = UserRepository(self.db_session)
+
+    @pytest.fixture(autouse=True)
+    async def setup_admin(self):
+        user = await self.repo.create(UserCreateSchema(**self.payload_user_register))
+        user.is_verified = True
+        user.verified_at = datetime.now()
+        user.profile.status_id = settings.STATUS_USER_ACTIVE
+        user.profile.role = "Admin"
+        await self.repo.add_one(user)
+
+        token = await AuthService(self.repo).login_user(LoginSchema(**self.payload_user_login))
+        self.headers = {"Authorization": f"Bearer {token.access_token}"}
+
+        self.publisher = await self.repo.add_one(HeroPublisher(name="Marvel"))
+
+    async def test_import_heroes_csv(self):
+        body = (
+            "name,age,secret_name,hero_publisher_id\n"
+            f"Tony Stark,40,Iron Man,{self.publisher.id}\n"
+            f"Peter Parker,abc,Spider-Man,{self.publisher.id}\n"
+        )
+        response = await self.client.post(
+            self.url, params={"format": "csv"}, content=body, headers={**self.headers, "Content-Type": "text/csv"}
+        )
+        data = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert data["total"] == 2
+        assert data["imported"] == 1
+        assert data["rejected"] == 1
+        assert data["errors"][0]["row"] == 3
+
+        heroes = (await self.db_session.exec(select(Hero))).all()
+        assert [hero.name for hero in heroes] == ["Tony Stark"]
+
+    async def test_import_heroes_admin_only(self):
+        response = await self.client.post(self.url, content="")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
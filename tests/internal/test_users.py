@@ -1,3 +1,4 @@
+import json
 import math
 from datetime import UTC, datetime, timedelta
 from random import randint
@@ -71,6 +72,20 @@ class TestInternalGetUsers:
         assert "id" in data
         assert data["username"] == "johndoe"
 
+    async def test_export_users_route(self):
+        url = f"{self.url}export"
+        response = await self.client.get(url, headers=self.headers)
+        rows = [json.loads(line) for line in response.text.splitlines()]
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["username"] for row in rows] == ["johndoe"]
+        assert rows[0]["profile"]["role"] == "Admin"
+        assert "password" not in rows[0]
+
+        # admin only
+        response = await self.client.get(url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
     async def test_get_user_route_no_token(self):
         # get user without token
         url = f"{self.url}{self.user.id}"
@@ -0,0 +1,30 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+
+from app.models import User
+from app.utils.search import LikeSearch, TrigramSearch, get_search_backend
+
+from . import pytest, pytestmark
+
+
+def test_get_search_backend():
+    assert isinstance(get_search_backend("postgresql"), TrigramSearch)
+    assert isinstance(get_search_backend("sqlite"), LikeSearch)
+    assert isinstance(get_search_backend("postgresql", "like"), LikeSearch)
+
+
+def test_trigram_search_ranks_by_similarity():
+    stmt = TrigramSearch().apply(select(User), [User.first_name, User.email], "john")
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "users.first_name ILIKE" in sql
+    assert "greatest(similarity(users.first_name" in sql
+    assert "DESC, users.id" in sql
+
+
+def test_like_search():
+    stmt = LikeSearch().apply(select(User), [User.first_name, User.email], "john")
+    sql = str(stmt.compile(dialect=sqlite.dialect()))
+
+    assert "lower(users.first_name) LIKE" in sql
+    assert "ORDER BY" not in sql
@@ -0,0 +1,55 @@
+from sqlalchemy import event, func
+from sqlmodel import select
+
+from app.models import Hero, HeroPublisher
+from app.repositories.hero_repo import HeroRepository
+
+from . import pytest, pytestmark
+
+
+@pytest.fixture
+def commits(db_session):
+    calls = []
+    event.listen(db_session.sync_session, "after_commit", lambda session: calls.append(session))
+    return calls
+
+
+async def test_unit_of_work_commits_once(db_session, commits):
+    repo = HeroRepository(db_session)
+
+    async with repo.unit_of_work():
+        publisher = await repo.add_one(HeroPublisher(name="Marvel"))
+        # flushed: the generated id is already there
+        assert publisher.id is not None
+
+        async with repo.unit_of_work():
+            await repo.add_all([
+                Hero(name="Hero A", secret_name="A", hero_publisher_id=publisher.id),
+                Hero(name="Hero B", secret_name="B", hero_publisher_id=publisher.id),
+            ])
+
+        assert commits == []
+
+    assert len(commits) == 1
+    assert await db_session.scalar(select(func.count()).select_from(Hero)) == 2
+
+
+async def test_unit_of_work_rolls_back_on_error(db_session, commits):
+    repo = HeroRepository(db_session)
+
+    with pytest.raises(RuntimeError):
+        async with repo.unit_of_work():
+            await repo.add_one(HeroPublisher(name="Marvel"))
+            raise RuntimeError()
+
+    assert commits == []
+    assert await db_session.scalar(select(func.count()).select_from(HeroPublisher)) == 0
+
+
+async def test_add_one_loads_relationship_from_foreign_key(db_session):
+    repo = HeroRepository(db_session)
+    publisher = await repo.add_one(HeroPublisher(name="Marvel"))
+
+    hero = await repo.add_one(Hero(name="Hero A", secret_name="A", hero_publisher_id=publisher.id))
+
+    assert hero.hero_publisher.name == "Marvel"
@@ -138,6 +138,13 @@ class TestAccountUser:
         assert "id" in data
         assert data["profile"]["photo"] is not None
 
+        # square variants, one url per encoded format
+        variants = data["profile"]["photo_variants"]
+        assert set(variants) == set(settings.PHOTO_VARIANT_SIZES)
+        for name, size in settings.PHOTO_VARIANT_SIZES.items():
+            assert variants[name]["width"] == variants[name]["height"] <= size
+            assert variants[name]["urls"]["jpeg"].startswith(settings.DOMAIN)
+
     async def test_upload_photo_profile_failed(self):
         # generate access_token
         access_token = await create_access_token(
@@ -7,6 +7,7 @@ from sqlmodel import Field, Session, SQLModel, and_, col, or_, select
 from app.core.config import settings
 from app.core.email import fm
 from app.core.security import create_access_token, decode_token
+from app.models import EmailOutbox
 from app.schemas.user_schema import UserCreateSchema
 from app.repositories.user_repo import UserRepository
 from app.services.auth_service import AuthService
@@ -44,6 +45,21 @@ class TestAuthUser:
             assert len(outbox) == 1  # mock email sent
             assert outbox[0]['To'] == "johndoe123@fastapi.com"
 
+    async def test_user_register_outbox(self, monkeypatch):
+        monkeypatch.setattr(settings, "EMAIL_BACKEND", "outbox")
+        fm.config.SUPPRESS_SEND = 1
+        with fm.record_messages() as outbox:
+            url = f"{self.url}register"
+            response = await self.client.post(url, json=self.payload_user_register)
+
+            assert response.status_code == status.HTTP_200_OK
+            # queued for the email worker, not sent from the request
+            assert len(outbox) == 0
+
+        rows = (await self.db_session.exec(select(EmailOutbox))).all()
+        assert len(rows) == 1
+        assert rows[0].recipients == ["johndoe123@fastapi.com"]
+
     async def test_user_register_422(self):
         url = f"{self.url}register"
         response = await self.client.post(url, json={})
@@ -5,7 +5,7 @@ from faker import Faker
 from fastapi import status
 from sqlmodel import Field, Session, SQLModel, and_, col, or_, select
 
-from app.models import HeroPublisher
+from app.models import Hero, HeroPublisher
 from app.schemas.hero_publisher_schema import HeroPublisherCreateSchema
 from app.repositories.hero_publisher_repo import HeroPublisherRepository
 
@@ -302,3 +302,45 @@ class TestListHeroPublisher:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert data["detail"] == "Sorting formatted incorrectly"
+
+
+class TestBulkHeroPublisher:
+    @pytest.fixture(autouse=True)
+    def init(self, client, api_prefix, db_session):
+        self.client = client
+        self.api_prefix = api_prefix
+        self.db_session = db_session
+        self.url = f"{self.api_prefix}/hero-publishers/bulk"
+
+    async def test_bulk_create_and_update(self):
+        response = await self.client.post(self.url, json=[{"name": "Marvel"}, {"name": None}, {"name": "DC"}])
+        data = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [publisher["name"] for publisher in data["results"]] == ["Marvel", "DC"]
+        assert [error["index"] for error in data["errors"]] == [1]
+
+        ids = [publisher["id"] for publisher in data["results"]]
+        response = await self.client.patch(self.url, json=[{"id": ids[1], "name": "DC Comics"}, {"name": "No id"}])
+        data = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [publisher["name"] for publisher in data["results"]] == ["DC Comics"]
+        assert data["errors"][0]["index"] == 1
+        assert "id" in data["errors"][0]["detail"]
+
+    async def test_bulk_delete_removes_heroes(self):
+        publisher = HeroPublisher(name="Marvel")
+        self.db_session.add(publisher)
+        await self.db_session.commit()
+        self.db_session.add(Hero(name="Hero A", age=20, secret_name="A", hero_publisher_id=publisher.id))
+        await self.db_session.commit()
+
+        response = await self.client.request("DELETE", self.url, json={"ids": [publisher.id]})
+        data = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert data == {"deleted": [publisher.id], "errors": []}
+
+        heroes = (await self.db_session.exec(select(Hero))).all()
+        assert heroes == []
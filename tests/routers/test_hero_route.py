@@ -1,4 +1,7 @@
 # import time
+import csv
+import io
+import json
 import math
 from random import randint
 
@@ -6,7 +9,9 @@ from faker import Faker
 from fastapi import status
 from sqlmodel import Field, Session, SQLModel, and_, col, or_, select
 
+from app.core.cache import count_cache
 from app.models import Hero, HeroPublisher
+from app.utils.pagination import encode_cursor
 from app.schemas.hero_schema import HeroCreateSchema
 from app.schemas.hero_publisher_schema import HeroPublisherCreateSchema
 from app.repositories.hero_publisher_repo import HeroPublisherRepository
@@ -313,3 +318,207 @@ async def test_read_heroes(client, api_prefix, db_session):
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert data["detail"] == "Sorting formatted incorrectly"
+
+
+async def test_read_heroes_cursor(client, api_prefix, db_session):
+    size = 5
+    n = 12
+
+    for i in range(n):
+        model = HeroCreateSchema(
+            name=fake.name(),
+            # repeated ages make the id tie-breaker matter
+            age=20 + (i % 3),
+            secret_name=fake.unique.first_name(),
+            hero_publisher_id=1
+        )
+        db_session.add(Hero.model_validate(model))
+
+    await db_session.commit()
+
+    url = f"{api_prefix}/heroes/"
+
+    for sorting in ["id:asc", "age:desc", "name:asc"]:
+        query_params = {"size": size, "sorting": sorting, "cursor": ""}
+        seen = []
+        while True:
+            response = await client.get(url, params=query_params)
+            data = response.json()
+
+            assert response.status_code == status.HTTP_200_OK
+            assert data["total"] is None
+            seen.extend(data["results"])
+
+            if not data["next_cursor"]:
+                assert data["links"]["next"] is None
+                break
+            query_params["cursor"] = data["next_cursor"]
+
+        # every row exactly once, in the requested order
+        assert len(seen) == n
+        assert len({hero["id"] for hero in seen}) == n
+
+        field, direction = sorting.split(":")
+        keys = [hero[field] for hero in seen]
+        assert keys == sorted(keys, reverse=direction == "desc")
+
+    # Test invalid cursor
+    response = await client.get(url, params={"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Cursor is invalid"
+
+    response = await client.get(url, params={"sorting": "age:asc", "cursor": encode_cursor(["old", 1])})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_read_heroes_count_strategy(client, api_prefix, db_session, payload_hero):
+    count_cache.clear()
+
+    for _ in range(3):
+        model = HeroCreateSchema(
+            name=fake.name(),
+            age=randint(20, 40),
+            secret_name=fake.unique.first_name(),
+            hero_publisher_id=1
+        )
+        db_session.add(Hero.model_validate(model))
+
+    await db_session.commit()
+
+    url = f"{api_prefix}/heroes/"
+
+    # Test default exact count
+    response = await client.get(url)
+    data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert data["total"] == 3
+    assert data["total_strategy"] == "exact"
+
+    # Test cached count
+    response = await client.get(url, params={"count": "cached"})
+    data = response.json()
+
+    assert data["total"] == 3
+    assert data["total_strategy"] == "cached"
+
+    # creating through the API invalidates the cached count
+    payload_hero.pop("id")
+    response = await client.post(url, json=payload_hero)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await client.get(url, params={"count": "cached"})
+    data = response.json()
+
+    assert data["total"] == 4
+
+    # Test estimate, not available on SQLite so it falls back to the cached count
+    response = await client.get(url, params={"count": "estimate"})
+    data = response.json()
+
+    assert data["total"] == 4
+    assert data["total_strategy"] == "cached"
+
+    # Test invalid strategy
+    response = await client.get(url, params={"count": "guess"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+#############################################
+# Export
+#############################################
+async def test_export_heroes(client, api_prefix, db_session, payload_hero_publisher, monkeypatch):
+    # several fetches per export
+    monkeypatch.setattr("app.core.config.settings.EXPORT_BATCH_SIZE", 2)
+
+    hero_publisher = HeroPublisher(**payload_hero_publisher)
+    db_session.add(hero_publisher)
+    for i in range(5):
+        db_session.add(Hero(name=f"Hero {i}", age=20 + i, secret_name=f"Secret {i}", hero_publisher_id=hero_publisher.id))
+    await db_session.commit()
+
+    url = f"{api_prefix}/heroes/export"
+
+    # Test NDJSON
+    response = await client.get(url)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="heroes.ndjson"' in response.headers["content-disposition"]
+    assert [row["name"] for row in rows] == [f"Hero {i}" for i in range(5)]
+    assert rows[0]["hero_publisher"]["name"] == hero_publisher.name
+
+    # Test CSV, nested objects become dotted columns
+    response = await client.get(url, params={"format": "csv", "search": "Hero 3"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(rows) == 1
+    assert rows[0]["name"] == "Hero 3"
+    assert rows[0]["hero_publisher.name"] == hero_publisher.name
+
+    # Test invalid format
+    response = await client.get(url, params={"format": "xml"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+#############################################
+# Bulk
+#############################################
+async def test_bulk_heroes(client, api_prefix, db_session, payload_hero_publisher):
+    hero_publisher = HeroPublisher(**payload_hero_publisher)
+    db_session.add(hero_publisher)
+    await db_session.commit()
+
+    url = f"{api_prefix}/heroes/bulk"
+
+    # Test create, bad items are reported without rejecting the batch
+    response = await client.post(url, json=[
+        {"name": "Hero A", "age": 20, "secret_name": "A", "hero_publisher_id": hero_publisher.id},
+        {"name": "Hero B", "age": -1, "secret_name": "B", "hero_publisher_id": hero_publisher.id},
+        {"name": "Hero C", "age": 30, "secret_name": "C", "hero_publisher_id": 999},
+        {"name": "Hero D", "age": 40, "secret_name": "D", "hero_publisher_id": hero_publisher.id},
+    ])
+    data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [hero["name"] for hero in data["results"]] == ["Hero A", "Hero D"]
+    assert data["results"][0]["hero_publisher"]["id"] == hero_publisher.id
+    assert [error["index"] for error in data["errors"]] == [1, 2]
+    assert "age" in data["errors"][0]["detail"]
+    assert data["errors"][1]["detail"] == "Hero Publisher with ID 999 not found"
+
+    ids = [hero["id"] for hero in data["results"]]
+
+    # Test update
+    response = await client.patch(url, json=[
+        {"id": ids[0], "age": 21},
+        {"id": ids[1], "name": "Hero D2"},
+        {"id": 999, "age": 1},
+    ])
+    data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [(hero["name"], hero["age"]) for hero in data["results"]] == [("Hero A", 21), ("Hero D2", 40)]
+    assert data["errors"] == [{"index": 2, "id": 999, "detail": "Hero with ID 999 not found"}]
+
+    # Test delete
+    response = await client.request("DELETE", url, json={"ids": [ids[0], 999]})
+    data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert data["deleted"] == [ids[0]]
+    assert data["errors"] == [{"index": 1, "id": 999, "detail": "Hero with ID 999 not found"}]
+
+    response = await client.get(f"{api_prefix}/heroes/")
+    assert response.json()["total"] == 1
+
+
+async def test_bulk_heroes_too_many_items(client, api_prefix, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.BULK_MAX_ITEMS", 2)
+
+    response = await client.post(f"{api_prefix}/heroes/bulk", json=[{}, {}, {}])
+
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
@@ -0,0 +1,64 @@
+import httpx
+from fastapi import FastAPI
+
+from app.core.config import Settings, settings
+from app.core.metrics import http_request_duration, redis_command_duration
+from app.core.redis import redismanager
+from app.main import app as main_app
+from app.middleware import MetricsMiddleware
+from app.routers import metrics_router
+
+from . import pytest, pytestmark
+
+
+@pytest.fixture
+async def metrics_client():
+    # /metrics is off by default, so serve it from an app of its own
+    app = FastAPI()
+
+    @app.get("/")
+    async def root():
+        return {"message": "ok"}
+
+    app.include_router(metrics_router.router)
+    app.add_middleware(MetricsMiddleware)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def test_metrics_disabled_by_default():
+    assert Settings.model_fields["METRICS_ENABLED"].default is False
+    assert ("/metrics" in [route.path for route in main_app.routes]) == settings.METRICS_ENABLED
+
+
+async def test_metrics(metrics_client):
+    before = http_request_duration.count("GET", "/")
+    response = await metrics_client.get("/")
+    assert response.status_code == 200
+    assert http_request_duration.count("GET", "/") == before + 1
+
+    await redismanager.client.get("metrics-test")
+    assert redis_command_duration.count("GET") >= 1
+
+    response = await metrics_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    body = response.text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/",le="0.005"}' in body
+    assert 'http_requests_total{method="GET",route="/",status="200"}' in body
+    # the scrape itself is in flight
+    assert "http_requests_in_flight 1" in body
+    assert 'redis_command_duration_seconds_count{command="GET"}' in body
+    assert 'db_pool_checked_out{engine="primary"}' in body
+    assert 'executor_queue_depth{executor="password-hasher"} 0' in body
+
+
+async def test_metrics_unmatched_route(metrics_client):
+    response = await metrics_client.get("/no/such/path")
+    assert response.status_code == 404
+
+    response = await metrics_client.get("/metrics")
+    assert 'route="unmatched",status="404"' in response.text
+    assert "/no/such/path" not in response.text
@@ -6,12 +6,20 @@ from PIL import Image  # type: ignore
 
 from app.core.config import settings
 from app.core.security import create_access_token
+from app.utils.file import image_processor
 from app.schemas.user_schema import UserCreateSchema
 from app.repositories.user_repo import UserRepository
 
 from . import pytest, pytestmark
 
 
+def make_image(size=(800, 600)) -> bytes:
+    # random pixels, so the content hash never matches an earlier upload
+    buf = BytesIO()
+    Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).save(buf, "JPEG")
+    return buf.getvalue()
+
+
 class TestMiscRoute:
     @pytest.fixture(autouse=True)
     def init(self, client, api_prefix, db_session, payload_user_register, payload_user_login):
@@ -62,6 +70,10 @@ class TestMiscRoute:
 
         assert response.status_code == 200
         assert "file_name" in data
+        assert set(data["variants"]) == set(settings.IMAGE_VARIANT_SIZES)
+        assert data["file_name"] == data["variants"]["large"]["urls"]["jpeg"]
+        assert max(data["variants"]["large"]["width"], data["variants"]["large"]["height"]) == 1280
+        assert max(data["variants"]["thumbnail"]["width"], data["variants"]["thumbnail"]["height"]) == 160
 
         # medium image
         root_dir = os.path.abspath(".")
@@ -92,6 +104,37 @@ class TestMiscRoute:
         assert response.status_code == 200
         assert "file_name" in data
 
+    async def test_upload_image_runs_in_executor(self, monkeypatch):
+        url = f"{self.upload_url}image"
+
+        completed = image_processor.stats()["completed"]
+        response = await self.client.post(url, headers=self.headers, files={"file": ("new.jpg", make_image())})
+
+        assert response.status_code == 200
+        assert image_processor.stats()["completed"] == completed + 1
+
+        # no room left in the queue: fail fast with 503 instead of stalling
+        monkeypatch.setattr(image_processor, "max_queue", 0)
+        response = await self.client.post(url, headers=self.headers, files={"file": ("new.jpg", make_image())})
+
+        assert response.status_code == 503
+
+    async def test_upload_image_deduplicated(self):
+        url = f"{self.upload_url}image"
+        image = make_image()
+
+        response = await self.client.post(url, headers=self.headers, files={"file": ("a.jpg", image)})
+        assert response.status_code == 200
+        first = response.json()
+
+        # same bytes under another name: served from the stored variants
+        completed = image_processor.stats()["completed"]
+        response = await self.client.post(url, headers=self.headers, files={"file": ("b.jpg", image)})
+
+        assert response.status_code == 200
+        assert response.json()["variants"] == first["variants"]
+        assert image_processor.stats()["completed"] == completed
+
     async def test_upload_image_failed(self):
         root_dir = os.path.abspath(".")
         file_path = os.path.join(root_dir, f"tests/data/test_file.pdf")
@@ -0,0 +1,155 @@
+import socket
+from datetime import datetime, timedelta
+
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.email import SMTPPool, build_message
+from app.models import EmailOutbox, User
+from app.repositories.email_outbox_repo import EmailOutboxRepository
+from app.repositories.user_repo import UserRepository
+from app.schemas.email_schema import EmailSchema
+from app.schemas.user_schema import UserCreateSchema
+from app.services.email_outbox_service import EmailOutboxService
+from app.services.mail_service import MailService
+
+from . import pytest, pytestmark
+
+
+class FakeSender:
+    """Stands in for SMTPPool, failing the first `failures` batches."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.sent = []
+
+    async def send_batch(self, messages):
+        if self.failures > 0:
+            self.failures -= 1
+            return [ConnectionError("smtp down") for _ in messages]
+
+        self.sent.extend(messages)
+        return [None for _ in messages]
+
+
+def make_email(to: str = "user@example.com") -> EmailSchema:
+    return EmailSchema(subject="Hello", emails=[to], body={"title": "Hello", "name": "John"})
+
+
+class TestEmailOutbox:
+    @pytest.fixture(autouse=True)
+    def init(self, db_session, sessionmanager, payload_user_register, monkeypatch):
+        self.db_session = db_session
+        self.sessionmanager = sessionmanager
+        self.payload_user_register = payload_user_register
+        self.repo = EmailOutboxRepository(self.db_session)
+        monkeypatch.setattr(settings, "EMAIL_BACKEND", "outbox")
+
+    async def outbox(self):
+        self.db_session.expire_all()
+        return (await self.db_session.exec(select(EmailOutbox).order_by(EmailOutbox.id))).all()
+
+    async def test_enqueued_with_the_user_transaction(self):
+        user_repo = UserRepository(self.db_session)
+
+        # the email is rolled back with the user
+        with pytest.raises(RuntimeError):
+            async with user_repo.unit_of_work():
+                user = await user_repo.create(UserCreateSchema(**self.payload_user_register))
+                await MailService(None, self.db_session).send_verification_email(user)
+                raise RuntimeError("abort")
+
+        assert await self.outbox() == []
+        assert (await self.db_session.exec(select(User))).all() == []
+
+        async with user_repo.unit_of_work():
+            user = await user_repo.create(UserCreateSchema(**self.payload_user_register))
+            await MailService(None, self.db_session).send_verification_email(user)
+
+        rows = await self.outbox()
+        assert len(rows) == 1
+        assert rows[0].recipients == [self.payload_user_register["email"]]
+        assert rows[0].template_name == "verification_email.html"
+        assert rows[0].status == "pending"
+
+    async def test_worker_retries_with_backoff(self):
+        await self.repo.enqueue(make_email(), "common_email.html")
+
+        sender = FakeSender(failures=1)
+        service = EmailOutboxService(self.sessionmanager.new_session, sender, backoff_base=60, backoff_max=600)
+
+        assert await service.run_once() == 1
+        row = (await self.outbox())[0]
+        assert row.status == "pending"
+        assert row.attempts == 1
+        assert "smtp down" in row.last_error
+        # retried no sooner than half the base delay (jitter), so nothing is due now
+        assert row.next_attempt_at >= datetime.now() + timedelta(seconds=25)
+        assert await service.run_once() == 0
+
+        row.next_attempt_at = datetime.now()
+        await self.repo.add_one(row)
+
+        assert await service.run_once() == 1
+        row = (await self.outbox())[0]
+        assert row.status == "sent"
+        assert row.sent_at is not None
+        assert sender.sent[0]["To"] == "user@example.com"
+
+    async def test_worker_gives_up_after_max_attempts(self):
+        await self.repo.enqueue(make_email(), "common_email.html")
+        await self.repo.enqueue(make_email(), "missing_template.html")
+
+        service = EmailOutboxService(self.sessionmanager.new_session, FakeSender(), max_attempts=1)
+
+        assert await service.run_once() == 2
+        sent, broken = await self.outbox()
+        assert sent.status == "sent"
+        assert broken.status == "failed"
+        assert broken.last_error.startswith("render:")
+
+    async def test_backoff_is_capped(self):
+        service = EmailOutboxService(self.sessionmanager.new_session, FakeSender(), backoff_base=30, backoff_max=100)
+
+        assert 15 <= service.backoff(1) <= 30
+        assert 50 <= service.backoff(10) <= 100
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def test_smtp_pool_reuses_sessions():
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    aiosmtplib = pytest.importorskip("aiosmtplib")
+
+    class Handler:
+        def __init__(self):
+            self.messages = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.messages.append(envelope)
+            return "250 OK"
+
+    handler = Handler()
+    port = free_port()
+    controller = controller_module.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+
+    try:
+        pool = SMTPPool(2, factory=lambda: aiosmtplib.SMTP(hostname="127.0.0.1", port=port, start_tls=False))
+        messages = [build_message("Hello", [f"user{i}@example.com"], {"title": "Hi", "name": "John"}, "common_email.html")
+                    for i in range(6)]
+
+        assert await pool.send_batch(messages) == [None] * 6
+        await pool.close()
+    finally:
+        controller.stop()
+
+    assert sorted(envelope.rcpt_tos[0] for envelope in handler.messages) == sorted(
+        f"user{i}@example.com" for i in range(6)
+    )
+    # six emails over at most two sessions
+    assert pool.connects <= 2
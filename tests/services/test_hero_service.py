@@ -1,8 +1,10 @@
+import json
 from typing import List, Optional
 
 from fastapi_pagination import Page, add_pagination, paginate
+from sqlmodel import select
 
-from app.models import Hero
+from app.models import Hero, HeroPublisher
 from app.schemas.hero_schema import HeroCreateSchema, HeroUpdateSchema
 from app.services.hero_service import HeroService
 from app.repositories.hero_repo import HeroRepository
@@ -69,3 +71,59 @@ class TestHeroService:
         assert exc.type == ResponseException
         assert exc.value.status_code == 404
         assert str(exc.value.detail) == f"Hero with ID {created.id} not found"
+
+
+class TestHeroImport:
+    @pytest.fixture(autouse=True)
+    async def init(self, db_session, monkeypatch):
+        # several batches per upload
+        monkeypatch.setattr("app.core.config.settings.IMPORT_BATCH_SIZE", 2)
+
+        self.db_session = db_session
+        self.repo = HeroRepository(self.db_session)
+        self.srv = HeroService(self.repo)
+
+        self.publisher = await self.repo.add_one(HeroPublisher(name="Marvel"))
+
+    @staticmethod
+    async def chunks(data: bytes, size: int = 7):
+        # small chunks split lines and multi-byte characters
+        for i in range(0, len(data), size):
+            yield data[i:i + size]
+
+    async def test_import_csv(self):
+        data = (
+            "name,age,secret_name,hero_publisher_id\n"
+            f"Tony Stark,40,Iron Man,{self.publisher.id}\n"
+            f"\"Banner, Bruce\",45,\"The\nHulk\",{self.publisher.id}\n"
+            f"Peter Parker,-1,Spider-Man,{self.publisher.id}\n"
+            "Wade Wilson,30,Deadpool,999\n"
+            "Missing,Columns\n"
+            f"Thor Odinsón,1500,Thor,{self.publisher.id}\n"
+        ).encode()
+
+        report = await self.srv.import_stream(self.chunks(data), "csv")
+
+        assert report["total"] == 6
+        assert report["imported"] == 3
+        assert report["rejected"] == 3
+        assert [error["row"] for error in report["errors"]] == [5, 6, 7]
+        assert "age" in report["errors"][0]["detail"]
+        assert report["errors"][1]["detail"] == "Hero Publisher with ID 999 not found"
+
+        heroes = (await self.db_session.exec(select(Hero).order_by(Hero.id))).all()
+        assert [hero.secret_name for hero in heroes] == ["Iron Man", "The\nHulk", "Thor"]
+        assert heroes[2].name == "Thor Odinsón"
+
+    async def test_import_ndjson(self):
+        data = (
+            json.dumps({"name": "Tony Stark", "age": 40, "secret_name": "Iron Man", "hero_publisher_id": self.publisher.id})
+            + "\n\nnot json\n[1]\n"
+        ).encode()
+
+        report = await self.srv.import_stream(self.chunks(data), "ndjson")
+
+        assert report["imported"] == 1
+        assert report["rejected"] == 2
+        assert [error["row"] for error in report["errors"]] == [3, 4]
+        assert report["rows_per_second"] > 0
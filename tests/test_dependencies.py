@@ -1,12 +1,15 @@
+import json
+import pickle
 from datetime import datetime
 
 from fastapi import status
 from unittest.mock import AsyncMock, MagicMock
 
+from app.core.cache import user_cache
 from app.core.config import settings
 from app.core.security import create_access_token, decode_token
 from app.dependencies import GetCurrentUser, get_settings
-from app.schemas.user_schema import UserCreateSchema
+from app.schemas.user_schema import UserCreateSchema, UserUpdateSchema
 from app.repositories.user_repo import UserRepository
 from app.utils.exceptions import AccountSuspended
 
@@ -157,3 +160,41 @@ class TestTokenBearer:
             await get_user(token_details, self.db_session, get_settings())
 
         assert exc.type == AccountSuspended
+
+    async def test_get_current_user_cached(self):
+        token = await create_access_token(
+            user_data={"email": self.user.email, "user_id": str(self.user.id)},
+        )
+        token_details = await decode_token(token)
+
+        get_user = GetCurrentUser()
+        response = await get_user(token_details, self.db_session, get_settings())
+        assert response.email == self.user.email
+
+        # second call is served from the cache
+        cached = await user_cache.get(self.user.email)
+        assert cached is not None
+        assert cached.profile.status_id == settings.STATUS_USER_ACTIVE
+        assert isinstance(cached.created_at, datetime)
+
+        # stored as JSON, without the password hash
+        entry = json.loads(user_cache._local.get(self.user.email))
+        assert "password" not in entry
+        assert entry["profile"]["status_id"] == settings.STATUS_USER_ACTIVE
+
+        response = await get_user(token_details, self.db_session, get_settings())
+        assert response.profile.role == "Admin"
+
+        # writes through the repository drop the cached copy
+        await self.repo.update_profile(response, UserUpdateSchema(first_name="Jane"))
+        assert await user_cache.get(self.user.email) is None
+
+        response = await get_user(token_details, self.db_session, get_settings())
+        assert response.first_name == "Jane"
+
+    async def test_user_cache_ignores_unreadable_entries(self):
+        # e.g. a pickled entry left behind by an older release
+        user_cache._local.set(self.user.email, pickle.dumps({"email": self.user.email}))
+
+        assert await user_cache.get(self.user.email) is None
+        assert user_cache._local.get(self.user.email) is None
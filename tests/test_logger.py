@@ -0,0 +1,133 @@
+import io
+import json
+import logging
+import os
+import queue
+import uuid
+
+from app import logger as app_logger
+from app.core.config import settings
+from app.logger import ACCESS_LOGGER_NAME, JsonFormatter, NonBlockingQueueHandler, SamplingFilter, setup_logging
+
+from . import pytest, pytestmark
+
+
+class Lazy:
+    """Counts how often it is turned into a string."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "lazy"
+
+
+@pytest.fixture
+def pipeline():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    logger = logging.getLogger("tests.logger")
+    logger.propagate = False
+
+    listener = setup_logging([handler], "INFO", logger=logger)
+
+    def drain():
+        # stopping the listener waits until everything queued has been written
+        listener.stop()
+        listener.start()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield logger, drain
+    listener.stop()
+    logger.handlers = []
+
+
+def test_json_lines_with_extra(pipeline):
+    logger, drain = pipeline
+    logger.info("user %s signed in", 42, extra={"path": "/auth/login"})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+
+    lines = drain()
+
+    assert lines[0]["message"] == "user 42 signed in"
+    assert lines[0]["level"] == "INFO"
+    assert lines[0]["logger"] == "tests.logger"
+    assert lines[0]["path"] == "/auth/login"
+    assert "ValueError: boom" in lines[1]["exc_info"]
+
+
+def test_record_queued_unformatted():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    value = Lazy()
+
+    handler.handle(logging.makeLogRecord({"msg": "value %s", "args": (value,)}))
+
+    # interpolated later by the listener thread, not by the caller
+    record = handler.queue.get_nowait()
+    assert record.msg == "value %s"
+    assert value.calls == 0
+    assert record.getMessage() == "value lazy"
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    logger = logging.getLogger("tests.logger.full")
+    logger.propagate = False
+    logger.handlers = [handler]
+
+    for _ in range(3):
+        logger.warning("message")
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
+    logger.handlers = []
+
+
+def test_sampling_keeps_errors_and_a_share_of_2xx():
+    def record(name, status_code=None):
+        record = logging.makeLogRecord({"name": name})
+        if status_code is not None:
+            record.status_code = status_code
+        return record
+
+    never = SamplingFilter(0.0)
+    assert not never.filter(record(ACCESS_LOGGER_NAME, 200))
+    assert never.filter(record(ACCESS_LOGGER_NAME, 404))
+    assert never.filter(record(ACCESS_LOGGER_NAME, 500))
+    assert never.filter(record("app.other", 200))
+
+    always = SamplingFilter(1.0)
+    assert always.filter(record(ACCESS_LOGGER_NAME, 204))
+
+    half = SamplingFilter(0.5)
+    kept = sum(half.filter(record(ACCESS_LOGGER_NAME, 200)) for _ in range(2000))
+    assert 800 < kept < 1200
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+@pytest.mark.skipif(not settings.LOG_FILE, reason="needs a log file")
+def test_forked_child_gets_its_own_listener():
+    # like a gunicorn --preload worker: the logger was set up before the fork
+    message = f"from child {uuid.uuid4().hex}"
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        code = 1
+        try:
+            logging.getLogger("tests.fork").error(message)
+            # waits for the child's listener to write the record
+            app_logger.stop_logging()
+            code = 0
+        finally:
+            os._exit(code)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    with open(settings.LOG_FILE) as f:
+        assert message in f.read()
@@ -0,0 +1,70 @@
+import logging
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.logger import ACCESS_LOGGER_NAME
+from app.middleware import AccessLogMiddleware
+
+from . import pytest, pytestmark
+
+
+@pytest.fixture
+async def access_client():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk {i}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(AccessLogMiddleware)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False, client=("10.0.0.1", 1234))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def access_records(caplog):
+    caplog.set_level(logging.INFO, logger=ACCESS_LOGGER_NAME)
+    return lambda: [record for record in caplog.records if record.name == ACCESS_LOGGER_NAME]
+
+
+async def test_access_log_route_template(access_client, access_records):
+    response = await access_client.get("/items/42")
+    assert response.status_code == 200
+
+    [record] = access_records()
+    assert record.route == "/items/{item_id}"
+    assert record.url == "/items/42"
+    assert record.status_code == 200
+    assert record.process_time > 0
+    assert record.getMessage().startswith('10.0.0.1:1234 - "GET /items/42" 200 - completed after ')
+
+
+async def test_access_log_streaming_and_errors(access_client, access_records):
+    response = await access_client.get("/stream")
+    assert response.text == "chunk 0\nchunk 1\nchunk 2\n"
+
+    response = await access_client.get("/boom")
+    assert response.status_code == 500
+
+    response = await access_client.get("/missing")
+    assert response.status_code == 404
+
+    records = access_records()
+    assert [record.status_code for record in records] == [200, 500, 404]
+    # unmatched requests fall back to the raw path
+    assert records[2].route == "/missing"
@@ -0,0 +1,69 @@
+import hashlib
+import io
+import os
+
+from fastapi import UploadFile
+from PIL import Image  # type: ignore
+
+from app.utils.file import (FileTooLarge, VARIANT_FORMATS, _render_variants, _resize_image, available_formats,
+                            spool_upload)
+
+from . import pytest, pytestmark
+
+
+def make_upload(data: bytes, filename: str = "photo.jpg") -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename)
+
+
+async def test_spool_upload_hashes_and_cleans_up():
+    data = os.urandom(3 * 1024 * 1024 + 5)
+
+    async with spool_upload(make_upload(data)) as upload:
+        assert upload.size == len(data)
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        with open(upload.path, "rb") as f:
+            assert f.read() == data
+
+    assert not os.path.exists(upload.path)
+
+
+async def test_spool_upload_aborts_over_limit():
+    with pytest.raises(FileTooLarge):
+        async with spool_upload(make_upload(b"x" * (2 * 1024 * 1024)), max_size=1024 * 1024):
+            pass  # pragma: no cover
+
+
+def test_resize_worker(tmp_path):
+    src = tmp_path / "large.jpg"
+    Image.new("RGB", (4000, 3000), "red").save(src, "JPEG")
+
+    _resize_image(str(src), str(tmp_path / "resized.jpg"))
+    with Image.open(tmp_path / "resized.jpg") as im:
+        assert im.size == (960, 720)
+
+
+def test_render_variants(tmp_path):
+    src = tmp_path / "large.jpg"
+    Image.new("RGB", (4000, 3000), "red").save(src, "JPEG")
+    sizes = {"thumbnail": 160, "large": 1280, "huge": 8000}
+
+    variants = _render_variants(str(src), str(tmp_path), sizes, VARIANT_FORMATS)
+
+    # never upscaled past the source
+    assert (variants["huge"]["width"], variants["huge"]["height"]) == (4000, 3000)
+    assert (variants["large"]["width"], variants["large"]["height"]) == (1280, 960)
+    assert (variants["thumbnail"]["width"], variants["thumbnail"]["height"]) == (160, 120)
+
+    for variant in variants.values():
+        assert set(variant["urls"]) == set(VARIANT_FORMATS)
+        for file_name in variant["urls"].values():
+            with Image.open(tmp_path / file_name) as im:
+                assert im.size == (variant["width"], variant["height"])
+
+    cropped = _render_variants(str(src), str(tmp_path), {"square": 256}, ["jpeg"], crop=True)
+    assert (cropped["square"]["width"], cropped["square"]["height"]) == (256, 256)
+
+
+def test_available_formats_keeps_jpeg_fallback():
+    assert available_formats(["webp", "bmp"])[0] == "jpeg"
+    assert "bmp" not in available_formats(["webp", "bmp"])
@@ -0,0 +1,87 @@
+import gzip
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.utils.static import CachedStaticFiles, accepted_encodings
+
+from . import pytest, pytestmark
+
+HASH = "ab" * 32
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    media = tmp_path / "media" / "images" / HASH[:2] / HASH
+    media.mkdir(parents=True)
+    (media / "large.jpg").write_bytes(bytes(range(256)) * 4)
+
+    (tmp_path / "media" / "files").mkdir(parents=True)
+    (tmp_path / "media" / "files" / "doc.pdf").write_bytes(b"%PDF-1.4")
+
+    css = b"body { color: red; }"
+    (tmp_path / "app.css").write_bytes(css)
+    (tmp_path / "app.css.gz").write_bytes(gzip.compress(css))
+    (tmp_path / "app.css.br").write_bytes(b"brotli bytes")
+    return tmp_path
+
+
+@pytest.fixture
+async def static_client(static_dir):
+    app = Starlette(routes=[Mount("/static", CachedStaticFiles(directory=static_dir))])
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, br;q=0, deflate;q=0.5") == {"gzip", "deflate"}
+    assert accepted_encodings("") == set()
+
+
+async def test_content_addressed_media_is_immutable(static_client):
+    url = f"/static/media/images/{HASH[:2]}/{HASH}/large.jpg"
+
+    response = await static_client.get(url)
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{HASH}-large.jpg"'
+    assert "immutable" in response.headers["cache-control"]
+
+    response = await static_client.get(url, headers={"If-None-Match": f'"{HASH}-large.jpg"'})
+    assert response.status_code == 304
+    assert "immutable" in response.headers["cache-control"]
+
+    response = await static_client.get("/static/media/files/doc.pdf")
+    assert response.status_code == 200
+    assert "immutable" not in response.headers["cache-control"]
+
+
+async def test_range_request(static_client):
+    url = f"/static/media/images/{HASH[:2]}/{HASH}/large.jpg"
+
+    response = await static_client.get(url, headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == "bytes 10-19/1024"
+    assert response.content == bytes(range(10, 20))
+
+    # a stale If-Range falls back to the full body
+    response = await static_client.get(url, headers={"Range": "bytes=10-19", "If-Range": '"other"'})
+    assert response.status_code == 200
+    assert len(response.content) == 1024
+
+
+async def test_precompressed_siblings(static_client):
+    response = await static_client.get("/static/app.css", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["content-type"].startswith("text/css")
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    response = await static_client.get("/static/app.css", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    # decoded by httpx
+    assert response.content == b"body { color: red; }"
+
+    response = await static_client.get("/static/app.css", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == b"body { color: red; }"
+